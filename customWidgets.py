@@ -1,8 +1,8 @@
 import os
 import sys
 import time
+import traceback
 
-import requests as requests
 from PyQt6 import QtWidgets, QtCore, QtGui
 
 class DownloadThread(QtCore.QThread):
@@ -18,6 +18,7 @@ class FileDownloadThread(DownloadThread):
         self.location = location
 
     def run(self):
+        import requests
         response = requests.get(self.url, stream=True)
         total_size_in_bytes = response.headers.get('content-length')
 
@@ -130,6 +131,86 @@ class DownloadDialog(ProgressDialog):
         super().__init__(baseLabelText, FileDownloadThread(url, location))
 
 
+class TaskCancelled(Exception):
+    pass
+
+class TaskThread(DownloadThread):
+    """
+    Runs task(report) off the GUI thread. The task calls report(stage, current, total) to update the
+    progress dialog, which also raises TaskCancelled once the user has asked to cancel.
+    """
+    stageSignal = QtCore.pyqtSignal(str)
+
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+        self.result = None
+        self.error = None
+        self.cancelled = False
+
+    def report(self, stage, current=0, total=1):
+        if self.cancelled:
+            raise TaskCancelled()
+        self.stageSignal.emit(stage)
+        self.updateProgressSignal.emit(int((current / total) * 100) if total else 0)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        self.setProgressBarTotalSignal.emit(100)
+        try:
+            self.result = self.task(self.report)
+        except TaskCancelled:
+            self.cancelled = True
+        except Exception as e:
+            traceback.print_exc()
+            self.error = e
+        self.doneSignal.emit()
+
+
+class TaskDialog(ProgressDialog):
+    def __init__(self, baseLabelText, task, parent=None):
+        super().__init__(baseLabelText, TaskThread(task))
+        if parent:
+            self.setParent(parent, QtCore.Qt.WindowType.Dialog)
+        self.setWindowTitle(baseLabelText)
+        self.download_thread.stageSignal.connect(self.set_stage)
+
+        self.cancel_button = QtWidgets.QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel)
+        self.layout.addWidget(self.cancel_button)
+
+    def set_stage(self, stage):
+        self.label.setText(f"{self.baseLabelText} - {stage}")
+
+    def cancel(self):
+        self.download_thread.cancel()
+        self.cancel_button.setEnabled(False)
+        self.label.setText(f"{self.baseLabelText} - Cancelling...")
+
+    def closeEvent(self, event):
+        # The dialog closes itself once the task actually stops
+        self.cancel()
+        event.ignore()
+
+    def reject(self):
+        self.cancel()
+
+    def run(self):
+        """
+        Show the dialog until the task is done, then return its result.
+        Raises TaskCancelled if it was cancelled, or the task's own exception if it failed.
+        """
+        self.exec()
+        self.download_thread.wait()
+        if self.download_thread.error:
+            raise self.download_thread.error
+        if self.download_thread.cancelled:
+            raise TaskCancelled()
+        return self.download_thread.result
+
+
 def format_eta(seconds) -> str:
     hours, remainder = divmod(seconds, 3600)
     minutes, seconds = divmod(remainder, 60)
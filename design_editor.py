@@ -1,26 +1,28 @@
+import time
+_import_start_time = time.perf_counter()
+
+import atexit
+import concurrent.futures
+import contextlib
 import copy
 import datetime
 import filecmp
 import hashlib
 import json
 import math
+import multiprocessing
 import os
 import re
 import shutil
 import subprocess
 import sys
-import tempfile
-import time
-import zipfile
 import zlib, struct
 
+# Heavy or action-specific dependencies (requests, xmltodict, Crypto, zipfile) are imported where they're used.
 import platformdirs as platformdirs
-import requests
 from typing import List, Union, Dict
+from collections import OrderedDict
 
-import xmltodict
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad
 from PyQt6 import QtWidgets, QtCore
 from PyQt6.QtCore import Qt, QRectF
 from PyQt6.QtGui import QColor, QImage
@@ -31,7 +33,40 @@ from PyQt6.QtGui import QPainter, QPainterPath, QColor
 from PyQt6.QtWidgets import QAbstractButton, QSizePolicy
 from io import BytesIO
 
-from customWidgets import DownloadDialog
+from customWidgets import DownloadDialog, TaskDialog, TaskCancelled
+
+
+class StartupTrace:
+    """
+    Collects how long each startup stage takes, so cold-start regressions show up in the console.
+    """
+    def __init__(self):
+        self.timings = []
+        self.depth = 0
+
+    def record(self, name, seconds):
+        self.timings.append((self.depth, name, seconds))
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        index = len(self.timings)
+        self.timings.append(None)  # Reserve the slot so nested stages are listed after their parent
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            self.timings[index] = (self.depth, name, time.perf_counter() - start)
+
+    def report(self):
+        print("Startup trace:")
+        for depth, name, seconds in self.timings:
+            print(f"{'  ' * (depth + 1)}{name:<{32 - depth * 2}} {seconds * 1000:8.1f} ms")
+        print(f"  {'total (until event loop)':<32} {(time.perf_counter() - _import_start_time) * 1000:8.1f} ms")
+
+startup_trace = StartupTrace()
+startup_trace.record("imports", time.perf_counter() - _import_start_time)
 
 sl2_encryption_key = bytes([0xB1, 0x56, 0x87, 0x9F, 0x13, 0x48, 0x97, 0x98, 0x70, 0x05, 0xC4, 0x87, 0x00, 0xAE, 0xF8, 0x79])
 
@@ -46,6 +81,7 @@ CATEGORY_OFFSETS = {
 
 color_section_labels = ["Head", "Core", "R arm", "L arm", "Legs", "R wep", "L wep", "R back", "L back"]
 color_labels = ["Main", "Sub", "Support", "Optional", "Other", "Device"]
+pattern_color_labels = ["Pattern Color 1", "Pattern Color 2", "Pattern Color 3", "Pattern Color 4"]
 materials_list = []
 for i in range(36):
     materials_list.append(f"{i} - Reflectiveness: {round(math.floor(i/6)*0.2, 2)} Luster: {round((i % 6) * 0.2,2)}")
@@ -67,23 +103,142 @@ VERSIONS_FILE = os.path.join(TOOLS_FOLDER, "versions.json")
 
 witchy_dir = os.path.join(TOOLS_FOLDER, "witchybnd")
 witchy_path = os.path.join(witchy_dir, "WitchyBND.exe")
-texconv_path = None
 
-def run_witchy(path:str, recursive:bool=False):
+
+class ScratchSpace:
+    """
+    Hands out working directories for unpacking and repacking. A RAM-backed location is used when there is one,
+    so the intermediate files never hit the disk. Every process gets its own private (0700) session directory,
+    so instances never clear each other's workspaces, and it's removed when the process exits. Workspaces are
+    reused between operations within a session: their old contents are only cleared when handed out again.
+    """
+    session_prefix = "ac6_tools_scratch-"
+    min_free_bytes = 512 * 1024 * 1024
+    # Sessions left behind by a process that crashed get pruned once they've been idle this long
+    max_idle_seconds = 7 * 24 * 60 * 60
+
+    def __init__(self, fallback_root):
+        self.fallback_root = fallback_root
+        self.root = None
+        self.in_use = set()
+        # Bytes left in workspaces by the operations of this session, per workspace name
+        self.bytes_written = {}
+        atexit.register(self.cleanup)
+
+    @staticmethod
+    def get_memory_roots() -> List[str]:
+        """
+        RAM-backed locations to try, in order. XDG_RUNTIME_DIR is private to the user, /dev/shm is shared but the
+        session directory made in it by mkdtemp isn't. Windows has neither, so it falls back to TOOLS_FOLDER.
+        """
+        memory_roots = []
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+        if runtime_dir and os.path.isdir(runtime_dir):
+            runtime_stat = os.stat(runtime_dir)
+            if runtime_stat.st_uid == os.getuid() and runtime_stat.st_mode & 0o077 == 0:
+                memory_roots.append(runtime_dir)
+        memory_roots.append("/dev/shm")
+        return memory_roots
+
+    def get_root(self) -> str:
+        # Picked on first use rather than at import, to keep startup free of disk checks
+        if self.root is not None and not os.path.isdir(self.root):
+            self.root = None
+        if self.root is None:
+            import tempfile
+            base_roots = (self.get_memory_roots() if hasattr(os, "getuid") else []) + [self.fallback_root]
+            for base_root in base_roots:
+                if base_root == self.fallback_root:
+                    os.makedirs(base_root, exist_ok=True)
+                elif not (os.path.isdir(base_root) and os.access(base_root, os.W_OK)
+                          and shutil.disk_usage(base_root).free >= self.min_free_bytes):
+                    continue
+                self.prune(base_root)
+                self.root = tempfile.mkdtemp(prefix=self.session_prefix, dir=base_root)
+                break
+        return self.root
+
+    @contextlib.contextmanager
+    def workspace(self, name):
+        """
+        Get an empty directory to work in, reusing the one named name unless it's already in use.
+        """
+        root = self.get_root()
+        workspace_name = name
+        suffix = 1
+        while workspace_name in self.in_use:
+            suffix += 1
+            workspace_name = f"{name}-{suffix}"
+        self.in_use.add(workspace_name)
+        path = os.path.join(root, workspace_name)
+        try:
+            self.clear(path)
+            # Marks the session as in use for other processes' prune
+            os.utime(root)
+            yield path
+        finally:
+            self.bytes_written[name] = self.bytes_written.get(name, 0) + self.get_size(path)
+            self.in_use.discard(workspace_name)
+
+    def get_bytes_written(self) -> int:
+        return sum(self.bytes_written.values())
+
+    @staticmethod
+    def clear(path):
+        if os.path.exists(path):
+            shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def get_size(path) -> int:
+        total_size = 0
+        for root, _, files in os.walk(path):
+            for filename in files:
+                with contextlib.suppress(OSError):
+                    total_size += os.path.getsize(os.path.join(root, filename))
+        return total_size
+
+    def cleanup(self):
+        if self.root is not None:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self.root = None
+
+    def prune(self, base_root):
+        owner = os.getuid() if hasattr(os, "getuid") else None
+        for entry in os.scandir(base_root):
+            if not entry.name.startswith(self.session_prefix) or not entry.is_dir(follow_symlinks=False):
+                continue
+            entry_stat = entry.stat(follow_symlinks=False)
+            if (owner is None or entry_stat.st_uid == owner) and time.time() - entry_stat.st_mtime > self.max_idle_seconds:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+scratch_space = ScratchSpace(os.path.join(TOOLS_FOLDER, "scratch"))
+
+# (number of paths, seconds) of every WitchyBND run
+witchy_timings = []
+
+def run_witchy(paths:Union[str, List[str]], recursive:bool=False) -> float:
+    """
+    Run WitchyBND over one or more paths. It takes several at once, so batching them only pays its startup once.
+    WitchyBND has no server mode to keep a warm process around, so batching is all there is.
+    :return: How long the run took in seconds
+    """
+    if isinstance(paths, str):
+        paths = [paths]
     #args = ["-p", f"\"{path}\""]
-    args = [witchy_path, "-s", path]
+    args = [witchy_path, "-s"]
     if recursive:
-        args.insert(2, "-c")
-    stuff = subprocess.run(args, check=True, capture_output=True, text=True)
+        args.append("-c")
+    start_time = time.perf_counter()
+    stuff = subprocess.run(args + list(paths), check=True, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start_time
+    witchy_timings.append((len(paths), elapsed))
     print(stuff.stderr)
-
-def convert_to_bc7(image_path:str) -> str:
-    filename = os.path.splitext(os.path.basename(image_path))[0]
-    folder_path = os.path.dirname(image_path)
-    subprocess.run([texconv_path, "-f", "BC7_UNORM", image_path, "-o", folder_path, "-y", "-m", "1"], check=True)
-    return os.path.join(folder_path,  f"{filename}.dds")
+    print(f"WitchyBND: {len(paths)} path(s) in {elapsed:.2f}s")
+    return elapsed
 
 def decrypt_file(input_file):
+    from Crypto.Cipher import AES
     with open(input_file, 'rb') as file:
         iv = file.read(16)
         ciphertext = file.read()
@@ -95,6 +250,8 @@ def decrypt_file(input_file):
         file.write(plaintext)
 
 def encrypt_file(input_file):
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import pad
     with open(input_file, 'rb') as file:
         plaintext = file.read()
 
@@ -105,6 +262,60 @@ def encrypt_file(input_file):
         file.write(cipher.iv)
         file.write(ciphertext)
 
+shared_list_models = {}
+def get_shared_list_model(name, items) -> QtCore.QStringListModel:
+    """
+    Get the model shared by every combo box showing the same fixed list, so the strings are only stored once.
+    """
+    if name not in shared_list_models:
+        shared_list_models[name] = QtCore.QStringListModel(items)
+    return shared_list_models[name]
+
+class SlotItemModel(QtCore.QStringListModel):
+    """
+    Model for a part/weapon slot. Items are "<ID> <Name>" strings, and an equipment ID -> row index is kept
+    alongside them so a part can be selected by exact ID without scanning every item.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.row_by_id: Dict[int, int] = {}
+
+    def setStringList(self, strings):
+        self.row_by_id = {}
+        for row, text in enumerate(strings):
+            try:
+                self.row_by_id.setdefault(int(text.split(' ')[0]), row)
+            except ValueError:
+                continue
+        super().setStringList(strings)
+
+    def row_for_id(self, equipment_id) -> int:
+        return self.row_by_id.get(equipment_id, -1)
+
+def attach_shared_model(combo_box:QComboBox, model:QtCore.QAbstractItemModel):
+    """
+    Point an editable combo box at a shared model. The completer goes through a sorted proxy of the same
+    model, so it follows any refresh of the model without holding its own copy of the items.
+    """
+    combo_box.setModel(model)
+    completion_model = QtCore.QSortFilterProxyModel(combo_box)
+    completion_model.setSourceModel(model)
+    completion_model.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    completion_model.setDynamicSortFilter(True)
+    completion_model.sort(0)
+
+    completer = QCompleter(completion_model, combo_box)
+    completer.setFilterMode(Qt.MatchFlag.MatchContains)
+    completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+    combo_box.setCompleter(completer)
+
+def no_report(stage, current=0, total=1):
+    """
+    Default progress callback for functions that can run headless or through customWidgets.TaskThread.
+    """
+    pass
+
 class CustomCheckBox(QAbstractButton):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -164,46 +375,317 @@ class ChunkHeader:
         return signature_bytes + header_bytes
 
 
+# BC7 encoding, only mode 6 is used: one subset, RGBA endpoints with 7 bits per channel plus a p-bit, and 4 bit indices.
+bc7_mode6_weights = [0, 4, 9, 13, 17, 21, 26, 30, 34, 38, 43, 47, 51, 55, 60, 64]
+
+def get_bc7_blocks(rgba):
+    """
+    Split an (H, W, 4) uint8 image into 4x4 blocks, padding the edges by repeating the last row/column.
+    :return: A (blocks_y * blocks_x, 16, 4) uint8 array, in the row-major block order BC7 stores them in
+    """
+    import numpy as np
+    height, width = rgba.shape[:2]
+    padded = np.pad(rgba, ((0, -height % 4), (0, -width % 4), (0, 0)), mode='edge')
+    blocks_y, blocks_x = padded.shape[0] // 4, padded.shape[1] // 4
+    return padded.reshape(blocks_y, 4, blocks_x, 4, 4).transpose(0, 2, 1, 3, 4).reshape(-1, 16, 4)
+
+def quantize_bc7_endpoints(endpoints):
+    """
+    Quantize (N, 4) float endpoints to 7 bits per channel plus a shared p-bit, picking whichever p-bit is closer.
+    Alpha errors count extra, so opaque images stay at 255 rather than 254.
+    :return: A tuple of ((N, 4) 7 bit values, (N,) p-bits)
+    """
+    import numpy as np
+    channel_weights = np.array([1, 1, 1, 4])
+    candidates = []
+    for pbit in (0, 1):
+        values = np.clip(np.rint((endpoints - pbit) / 2), 0, 127)
+        error = ((((values * 2 + pbit) - endpoints) ** 2) * channel_weights).sum(axis=1)
+        candidates.append((values, error))
+    use_one = candidates[1][1] < candidates[0][1]
+    values = np.where(use_one[:, np.newaxis], candidates[1][0], candidates[0][0]).astype(np.int64)
+    return values, use_one.astype(np.int64)
+
+def encode_bc7(rgba) -> bytes:
+    """
+    Encode an (H, W, 4) uint8 RGBA image as BC7 blocks, all of them at once.
+    Endpoints are picked along each block's principal axis, which is plenty for thumbnails.
+    """
+    import numpy as np
+    pixels = get_bc7_blocks(np.asarray(rgba, dtype=np.uint8)).astype(np.float64)
+    block_count = len(pixels)
+
+    # Principal axis of every block through a few rounds of power iteration on its covariance
+    mean = pixels.mean(axis=1)
+    centered = pixels - mean[:, np.newaxis]
+    covariance = np.einsum('npi,npj->nij', centered, centered)
+    axis = np.ones((block_count, 4))
+    for _ in range(8):
+        axis = np.einsum('nij,nj->ni', covariance, axis)
+        axis /= np.maximum(np.linalg.norm(axis, axis=1, keepdims=True), 1e-12)
+    projections = np.einsum('npi,ni->np', centered, axis)
+    endpoint0 = np.clip(mean + projections.min(axis=1)[:, np.newaxis] * axis, 0, 255)
+    endpoint1 = np.clip(mean + projections.max(axis=1)[:, np.newaxis] * axis, 0, 255)
+
+    values0, pbit0 = quantize_bc7_endpoints(endpoint0)
+    values1, pbit1 = quantize_bc7_endpoints(endpoint1)
+
+    # Pick the closest of the 16 interpolated colors for every pixel
+    weights = np.array(bc7_mode6_weights, dtype=np.int64)[np.newaxis, :, np.newaxis]
+    color0 = (values0 * 2 + pbit0[:, np.newaxis])[:, np.newaxis, :]
+    color1 = (values1 * 2 + pbit1[:, np.newaxis])[:, np.newaxis, :]
+    palette = ((64 - weights) * color0 + weights * color1 + 32) >> 6
+    distances = ((pixels[:, :, np.newaxis, :] - palette[:, np.newaxis, :, :]) ** 2).sum(axis=3)
+    indices = distances.argmin(axis=2)
+
+    # The first pixel's index is stored with an implicit 0 top bit, swap the endpoints wherever it's set
+    swap = indices[:, 0] >= 8
+    values0, values1 = np.where(swap[:, np.newaxis], values1, values0), np.where(swap[:, np.newaxis], values0, values1)
+    pbit0, pbit1 = np.where(swap, pbit1, pbit0), np.where(swap, pbit0, pbit1)
+    indices = np.where(swap[:, np.newaxis], 15 - indices, indices)
+
+    bits = np.zeros((block_count, 128), dtype=np.uint8)
+    position = 0
+    def write(values, width):
+        nonlocal position
+        bits[:, position:position + width] = (values[:, np.newaxis] >> np.arange(width)) & 1
+        position += width
+
+    write(np.full(block_count, 1 << 6), 7)  # Mode 6
+    for channel in range(4):
+        write(values0[:, channel], 7)
+        write(values1[:, channel], 7)
+    write(pbit0, 1)
+    write(pbit1, 1)
+    write(indices[:, 0], 3)
+    for pixel in range(1, 16):
+        write(indices[:, pixel], 4)
+    return np.packbits(bits, axis=1, bitorder='little').tobytes()
+
+# Everything below is only needed to decode BC7 thumbnails from saves, which may use any of the 8 modes.
+# Pixel subset assignments for the 2 and 3 subset partitions, one string per partition in pixel order
+bc7_partitions2 = [
+    '0011001100110011', '0001000100010001', '0111011101110111', '0001001100110111', '0000000100010011', '0011011101111111',
+    '0001001101111111', '0000000100110111', '0000000000010011', '0011011111111111', '0000000101111111', '0000000000010111',
+    '0001011111111111', '0000000011111111', '0000111111111111', '0000000000001111', '0000100011101111', '0111000100000000',
+    '0000000010001110', '0111001100010000', '0011000100000000', '0000100011001110', '0000000010001100', '0111001100110001',
+    '0011000100010000', '0000100010001100', '0110011001100110', '0011011001101100', '0001011111101000', '0000111111110000',
+    '0111000110001110', '0011100110011100', '0101010101010101', '0000111100001111', '0101101001011010', '0011001111001100',
+    '0011110000111100', '0101010110101010', '0110100101101001', '0101101010100101', '0111001111001110', '0001001111001000',
+    '0011001001001100', '0011101111011100', '0110100110010110', '0011110011000011', '0110011010011001', '0000011001100000',
+    '0100111001000000', '0010011100100000', '0000001001110010', '0000010011100100', '0110110010010011', '0011011011001001',
+    '0110001110011100', '0011100111000110', '0110110011001001', '0110001100111001', '0111111010000001', '0001100011100111',
+    '0000111100110011', '0011001111110000', '0010001011101110', '0100010001110111',
+]
+bc7_partitions3 = [
+    '0011001102212222', '0001001122112221', '0000200122112211', '0222002200110111', '0000000011221122', '0011001100220022',
+    '0022002211111111', '0011001122112211', '0000000011112222', '0000111111112222', '0000111122222222', '0012001200120012',
+    '0112011201120112', '0122012201220122', '0011011211221222', '0011200122002220', '0001001101121122', '0111001120012200',
+    '0000112211221122', '0022002200221111', '0111011102220222', '0001000122212221', '0000001101220122', '0000110022102210',
+    '0122012200110000', '0012001211222222', '0110122112210110', '0000011012211221', '0022110211020022', '0110011020022222',
+    '0011012201220011', '0000200022112221', '0000000211221222', '0222002200120011', '0011001200220222', '0120012001200120',
+    '0000111122220000', '0120120120120120', '0120201212010120', '0011220011220011', '0011112222000011', '0101010122222222',
+    '0000000021212121', '0022112200221122', '0022001100220011', '0220122102201221', '0101222222220101', '0000212121212121',
+    '0101010101012222', '0222011102220111', '0002111200021112', '0000211221122112', '0222011101110222', '0002111211120002',
+    '0110011001102222', '0000000021122112', '0110011022222222', '0022001100110022', '0022112211220022', '0000000000002112',
+    '0002000100020001', '0222122202221222', '0101222222222222', '0111201122012220',
+]
+# The anchor pixel of the second (and third) subset, whose index has an implicit 0 top bit
+bc7_anchors2 = [15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 2, 8, 2, 2, 8, 8, 15, 2, 8, 2, 2, 8, 8, 2, 2,
+                15, 15, 6, 8, 2, 8, 15, 15, 2, 8, 2, 2, 2, 15, 15, 6, 6, 2, 6, 8, 15, 15, 2, 2, 15, 15, 15, 15, 15, 2, 2, 15]
+bc7_anchors3_second = [3, 3, 15, 15, 8, 3, 15, 15, 8, 8, 6, 6, 6, 5, 3, 3, 3, 3, 8, 15, 3, 3, 6, 10, 5, 8, 8, 6, 8, 5, 15, 15,
+                       8, 15, 3, 5, 6, 10, 8, 15, 15, 3, 15, 5, 15, 15, 15, 15, 3, 15, 5, 5, 5, 8, 5, 10, 5, 10, 8, 13, 15, 12, 3, 3]
+bc7_anchors3_third = [15, 8, 8, 3, 15, 15, 3, 8, 15, 15, 15, 15, 15, 15, 15, 8, 15, 8, 15, 3, 15, 8, 15, 8, 3, 15, 6, 10, 15, 15, 10, 8,
+                      15, 3, 15, 10, 10, 8, 9, 10, 6, 15, 8, 15, 3, 6, 6, 8, 15, 3, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 3, 15, 15, 8]
+bc7_weights = {
+    2: [0, 21, 43, 64],
+    3: [0, 9, 18, 27, 37, 46, 55, 64],
+    4: bc7_mode6_weights,
+}
+# mode: (subsets, partition bits, rotation bits, index selection bits, color bits, alpha bits,
+#        per-endpoint p-bits, shared p-bits, index bits, secondary index bits)
+bc7_modes = [
+    (3, 4, 0, 0, 4, 0, True, False, 3, 0),
+    (2, 6, 0, 0, 6, 0, False, True, 3, 0),
+    (3, 6, 0, 0, 5, 0, False, False, 2, 0),
+    (2, 6, 0, 0, 7, 0, True, False, 2, 0),
+    (1, 0, 2, 1, 5, 6, False, False, 2, 3),
+    (1, 0, 2, 0, 7, 8, False, False, 2, 2),
+    (1, 0, 0, 0, 7, 7, True, False, 4, 0),
+    (2, 6, 0, 0, 5, 5, True, False, 2, 0),
+]
+
+def get_bc7_subset_tables():
+    """
+    :return: A tuple of ((3, 64, 16) subset of every pixel, (3, 64, 16) whether every pixel is an anchor), indexed by subset count - 1
+    """
+    import numpy as np
+    subsets = np.zeros((3, 64, 16), dtype=np.int64)
+    subsets[1] = [[int(subset) for subset in partition] for partition in bc7_partitions2]
+    subsets[2] = [[int(subset) for subset in partition] for partition in bc7_partitions3]
+    anchors = np.zeros((3, 64, 16), dtype=bool)
+    anchors[:, :, 0] = True
+    anchors[1, np.arange(64), bc7_anchors2] = True
+    anchors[2, np.arange(64), bc7_anchors3_second] = True
+    anchors[2, np.arange(64), bc7_anchors3_third] = True
+    return subsets, anchors
+
+def read_bc7_indices(bits, start, index_bits, anchors):
+    """
+    Read 16 indices per block, anchor pixels having one bit less.
+    :param anchors: A (N, 16) bool array
+    :return: A tuple of ((N, 16) indices, the bit position after them)
+    """
+    import numpy as np
+    widths = index_bits - anchors.astype(np.int64)
+    offsets = start + np.cumsum(widths, axis=1) - widths
+    positions = offsets[:, :, np.newaxis] + np.arange(index_bits)
+    values = np.take_along_axis(bits, np.minimum(positions, 127).reshape(len(bits), -1), axis=1).reshape(positions.shape)
+    values = np.where(np.arange(index_bits) < widths[:, :, np.newaxis], values.astype(np.int64), 0)
+    return (values << np.arange(index_bits)).sum(axis=2), start + 16 * index_bits - int(anchors[0].sum())
+
+def decode_bc7_mode(bits, mode):
+    """
+    Decode the blocks of one mode.
+    :param bits: A (N, 128) uint8 array of block bits, least significant first
+    :return: A (N, 16, 4) uint8 array
+    """
+    import numpy as np
+    subset_count, partition_bits, rotation_bits, selection_bits, color_bits, alpha_bits, endpoint_pbits, shared_pbits, index_bits, index_bits2 = bc7_modes[mode]
+    block_count = len(bits)
+    position = mode + 1
+    def read(width):
+        nonlocal position
+        values = (bits[:, position:position + width].astype(np.int64) << np.arange(width)).sum(axis=1)
+        position += width
+        return values
+
+    partition = read(partition_bits)
+    rotation = read(rotation_bits)
+    selection = read(selection_bits)
+    # (N, subsets * 2, 4) endpoints, subset-major
+    endpoints = np.zeros((block_count, subset_count * 2, 4), dtype=np.int64)
+    for channel in range(3):
+        for endpoint in range(subset_count * 2):
+            endpoints[:, endpoint, channel] = read(color_bits)
+    for endpoint in range(subset_count * 2):
+        endpoints[:, endpoint, 3] = read(alpha_bits) if alpha_bits else 255
+
+    channel_bits = np.array([color_bits] * 3 + [alpha_bits])
+    if endpoint_pbits or shared_pbits:
+        if endpoint_pbits:
+            pbits = np.stack([read(1) for _ in range(subset_count * 2)], axis=1)
+        else:
+            pbits = np.repeat(np.stack([read(1) for _ in range(subset_count)], axis=1), 2, axis=1)
+        endpoints = (endpoints << 1) | pbits[:, :, np.newaxis]
+        channel_bits = channel_bits + 1
+    # Expand to 8 bits by repeating the top bits
+    endpoints = (endpoints << (8 - channel_bits)) | (endpoints >> np.maximum(2 * channel_bits - 8, 0))
+    if not alpha_bits:
+        endpoints[:, :, 3] = 255
+
+    subset_tables, anchor_tables = get_bc7_subset_tables()
+    subsets = subset_tables[subset_count - 1][partition]
+    anchors = anchor_tables[subset_count - 1][partition]
+    indices, position = read_bc7_indices(bits, position, index_bits, anchors)
+    if index_bits2:
+        indices2, position = read_bc7_indices(bits, position, index_bits2, anchor_tables[0][partition])
+        # Modes 4 and 5 have separate indices for alpha, the selection bit swaps which set the colors use
+        color_weights = np.where(selection[:, np.newaxis] == 1, np.array(bc7_weights[index_bits2])[indices2], np.array(bc7_weights[index_bits])[indices])
+        alpha_weights = np.where(selection[:, np.newaxis] == 1, np.array(bc7_weights[index_bits])[indices], np.array(bc7_weights[index_bits2])[indices2])
+        weights = np.stack([color_weights] * 3 + [alpha_weights], axis=2)
+    else:
+        weights = np.repeat(np.array(bc7_weights[index_bits])[indices][:, :, np.newaxis], 4, axis=2)
+
+    low = np.take_along_axis(endpoints, (subsets * 2)[:, :, np.newaxis], axis=1)
+    high = np.take_along_axis(endpoints, (subsets * 2 + 1)[:, :, np.newaxis], axis=1)
+    pixels = ((64 - weights) * low + weights * high + 32) >> 6
+
+    # Rotation swaps alpha with one of the color channels
+    for rotated_channel in range(3):
+        rotated = rotation == rotated_channel + 1
+        pixels[rotated, :, rotated_channel], pixels[rotated, :, 3] = pixels[rotated, :, 3], pixels[rotated, :, rotated_channel].copy()
+    return pixels.astype(np.uint8)
+
+def decode_bc7(data, width, height):
+    """
+    Decode BC7 blocks to an (H, W, 4) uint8 RGBA image. Blocks with an invalid mode come out transparent black.
+    """
+    import numpy as np
+    blocks_x, blocks_y = (width + 3) // 4, (height + 3) // 4
+    blocks = np.frombuffer(data, dtype=np.uint8, count=blocks_x * blocks_y * 16).reshape(-1, 16)
+    bits = np.unpackbits(blocks, axis=1, bitorder='little')
+    has_mode = bits[:, :8].any(axis=1)
+    modes = np.where(has_mode, bits[:, :8].argmax(axis=1), -1)
+
+    pixels = np.zeros((len(blocks), 16, 4), dtype=np.uint8)
+    for mode in np.unique(modes[modes >= 0]):
+        pixels[modes == mode] = decode_bc7_mode(bits[modes == mode], int(mode))
+    image = pixels.reshape(blocks_y, blocks_x, 4, 4, 4).transpose(0, 2, 1, 3, 4).reshape(blocks_y * 4, blocks_x * 4, 4)
+    return image[:height, :width]
+
+def qimage_to_rgba(image):
+    """
+    :return: An (H, W, 4) uint8 array of the image's pixels
+    """
+    import numpy as np
+    image = image.convertToFormat(QImage.Format.Format_RGBA8888)
+    pixel_bytes = image.constBits().asstring(image.sizeInBytes())
+    rows = np.frombuffer(pixel_bytes, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+    return rows[:, :image.width() * 4].reshape(image.height(), image.width(), 4).copy()
+
+def rgba_to_qimage(rgba) -> QImage:
+    import numpy as np
+    rgba = np.ascontiguousarray(rgba, dtype=np.uint8)
+    height, width = rgba.shape[:2]
+    # copy() so the QImage owns its pixels instead of pointing into the array
+    return QImage(rgba.tobytes(), width, height, width * 4, QImage.Format.Format_RGBA8888).copy()
+
+
 class ACThumbnail:
     width = 356
     height = 124
     unk04 = 1424
+    # Bump whenever encode_bc7 or the scaling changes, so EncodedThumbnailCache doesn't hand out stale encodes
+    encoder_version = 1
 
     def __init__(self):
         self.pixel_data = b''
         self.data_length = 44144
     @classmethod
-    def from_image(cls, image_path):
+    def from_image(cls, image_path, cache=None):
+        """
+        :param cache: EncodedThumbnailCache to reuse earlier encodes of the same image from, defaults to the one in TOOLS_FOLDER
+        """
+        cache = cache or encoded_thumbnail_cache
+        with open(image_path, 'rb') as file:
+            image_bytes = file.read()
+        cache_key = cache.make_key(image_bytes, cls.width, cls.height, cls.encoder_version)
         thumbnail = cls()
+        pixel_data = cache.get(cache_key)
+        if pixel_data is not None and len(pixel_data) == thumbnail.data_length:
+            thumbnail.pixel_data = pixel_data
+            return thumbnail
+
+        image = QImage.fromData(image_bytes)
+        if image.isNull():
+            raise ValueError(f"Could not load image {image_path}")
+        resized_image = image.scaled(cls.width, cls.height, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        thumbnail = cls.from_rgba(qimage_to_rgba(resized_image))
+        cache.put(cache_key, thumbnail.pixel_data)
+        return thumbnail
 
-        # Create a temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Copy the image to the temporary directory
-            temp_image_path = os.path.join(temp_dir, os.path.basename(image_path))
-            shutil.copy2(image_path, temp_image_path)
-
-            # Resize the image
-            image = QImage(temp_image_path)
-            resized_image = image.scaled(thumbnail.width, thumbnail.height, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            resized_image_path = os.path.join(temp_dir, "resized_image.png")
-            resized_image.save(resized_image_path)
-
-            # Convert to BC7
-            bc7_image_path = convert_to_bc7(resized_image_path)
-
-            # Load the DDS file's bytes
-            with open(bc7_image_path, 'rb') as f:
-                dds_data = f.read()
-
-            header_offset = 148
-            thumbnail.pixel_data = dds_data[header_offset:thumbnail.data_length]
-
-            # Ensure the pixel data is the correct length
-            if len(thumbnail.pixel_data) < thumbnail.data_length:
-                thumbnail.pixel_data += b'\x00' * (thumbnail.data_length - len(thumbnail.pixel_data))
-            elif len(thumbnail.pixel_data) > thumbnail.data_length:
-                thumbnail.pixel_data = thumbnail.pixel_data[:thumbnail.data_length]
-
+    @classmethod
+    def from_rgba(cls, rgba):
+        """
+        :param rgba: A (124, 356, 4) uint8 array
+        """
+        thumbnail = cls()
+        if tuple(rgba.shape) != (cls.height, cls.width, 4):
+            raise ValueError(f"Thumbnails have to be {cls.width}x{cls.height} RGBA, got {rgba.shape}")
+        thumbnail.pixel_data = encode_bc7(rgba)
+        if len(thumbnail.pixel_data) != thumbnail.data_length:
+            raise ValueError("Pixel data length does not match the specified data length")
         return thumbnail
 
     def to_bytes(self):
@@ -255,6 +737,83 @@ class ACThumbnail:
 
         return thumbnail
 
+class EncodedThumbnailCache:
+    """
+    On-disk cache of encoded thumbnail pixel data, one file per source image and encoder settings.
+    Files are touched on every hit, and the least recently used ones are deleted once the folder grows past max_bytes.
+    """
+    def __init__(self, folder, max_bytes=32 * 1024 * 1024):
+        self.folder = folder
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(image_bytes, *settings) -> str:
+        key_hash = hashlib.sha1(image_bytes)
+        key_hash.update(repr(settings).encode('utf-8'))
+        return key_hash.hexdigest()
+
+    def get(self, key):
+        path = os.path.join(self.folder, f"{key}.bc7")
+        try:
+            with open(path, 'rb') as file:
+                pixel_data = file.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return pixel_data
+
+    def put(self, key, pixel_data):
+        os.makedirs(self.folder, exist_ok=True)
+        path = os.path.join(self.folder, f"{key}.bc7")
+        with open(f"{path}.tmp", 'wb') as file:
+            file.write(pixel_data)
+        os.replace(f"{path}.tmp", path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.folder):
+            if entry.name.endswith(".bc7"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            total_size -= size
+
+encoded_thumbnail_cache = EncodedThumbnailCache(os.path.join(TOOLS_FOLDER, "thumbnail_cache"))
+
+
+class ThumbnailCache:
+    """
+    LRU cache of decoded thumbnails, keyed by the hash of their BC7 payload so identical thumbnails share one image.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.images: OrderedDict = OrderedDict()
+        self.total_bytes = 0
+
+    def get(self, thumbnail:ACThumbnail) -> QImage:
+        key = hashlib.sha1(thumbnail.pixel_data).digest()
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            return image
+
+        image = rgba_to_qimage(decode_bc7(thumbnail.pixel_data, thumbnail.width, thumbnail.height))
+        self.images[key] = image
+        self.total_bytes += image.sizeInBytes()
+        while self.total_bytes > self.max_bytes and len(self.images) > 1:
+            _, evicted = self.images.popitem(last=False)
+            self.total_bytes -= evicted.sizeInBytes()
+        return image
+
+thumbnail_cache = ThumbnailCache()
+
+
 class AsmcHeader:
     def __init__(self, compressed_size, uncompressed_size):
         self.magic = b"ASMC"
@@ -281,10 +840,11 @@ class ASMC:
 
     @classmethod
     def from_bytes(cls, data):
-        header = AsmcHeader.from_bytes(data[:16])
-        compressed_data = data[16:16+header.compressed_size]
-        decompressed_data = zlib.decompress(compressed_data)
-        return cls(decompressed_data)
+        # Keep the compressed data as-is, it only gets decompressed when something actually needs the design
+        asmc = cls(None)
+        asmc.header = AsmcHeader.from_bytes(data[:16])
+        asmc.compressed_data = data[16:16+asmc.header.compressed_size]
+        return asmc
 
     def to_bytes(self):
         return self.header.to_bytes() + self.compressed_data
@@ -467,6 +1027,17 @@ class ColorRowData:
         self.material = material
         self.pattern = pattern
 
+def dropdown_value_to_int(value, separator=" ", position=1) -> int:
+    """
+    Get the index out of a dropdown string (e.g. "Pattern 3", "1 - Medium").
+    Values read straight from a Coloring chunk are already ints (or numeric strings), and are returned as-is.
+    """
+    if isinstance(value, int):
+        return value
+    if value.isnumeric():
+        return int(value)
+    return int(value.split(separator)[position])
+
 class ColoringSectionData:
     def __init__(self, name):
         self.name = name
@@ -476,10 +1047,25 @@ class ColoringSectionData:
         self.pattern_colors = []
         self.weathering = None
 
+    @classmethod
+    def default(cls, name):
+        """
+        The settings of a section nobody has touched yet, used both by a freshly built ColoringSection and for sections that were never built.
+        """
+        coloring_section = cls(name)
+        for color_label in color_labels:
+            material = "90" if color_label == "Device" else "0"
+            coloring_section.color_rows.append(ColorRowData(color_label, QColor("gray"), material, False))
+        coloring_section.pattern_number = 0
+        coloring_section.pattern_size = 0
+        coloring_section.pattern_colors = [QColor("gray") for _ in range(4)]
+        coloring_section.weathering = 0
+        return coloring_section
+
     def to_bytes(self):
         data = bytearray()
         data.extend(b'\xff\x00\x00\x00')  # unk00
-        data.extend(struct.pack('<h', int(self.weathering.split(" ")[1]) or 0))  # weathering
+        data.extend(struct.pack('<h', dropdown_value_to_int(self.weathering) or 0))  # weathering
         data.extend(b'\x00\x00')  # unk06
 
         for color_row in self.color_rows:
@@ -490,11 +1076,11 @@ class ColoringSectionData:
             material = color_row.material
             material_index = 0  # Default to 0 if material is not found
             if material:
-                material_index = int(material.split(' - ')[0])  # Extract the material index from the string
+                material_index = dropdown_value_to_int(material, ' - ', 0)  # Extract the material index from the string
             data.extend(struct.pack('<h', material_index))
 
-        data.extend(struct.pack('<B', int(self.pattern_number.split(" ")[1]) or 0))  # patternDesign
-        data.extend(struct.pack('<B', int(self.pattern_size.split(" - ")[0]) or 0))  # patternSize
+        data.extend(struct.pack('<B', dropdown_value_to_int(self.pattern_number) or 0))  # patternDesign
+        data.extend(struct.pack('<B', dropdown_value_to_int(self.pattern_size, " - ", 0) or 0))  # patternSize
         data.extend(b'\x00\x00')  # unk2e
 
         for color in self.pattern_colors:
@@ -582,6 +1168,9 @@ class ColorRow(QWidget):
     def __init__(self, color_label, parent=None):
         super().__init__(parent)
         self.color_name = color_label
+        self.color = QColor("gray")
+        # Material read from a design that isn't in the dropdown, kept as is until the user picks another one
+        self.unlisted_material = None
         self.initUI()
 
     def initUI(self):
@@ -597,7 +1186,8 @@ class ColorRow(QWidget):
         layout.addWidget(self.color_picker)
 
         self.material_dropdown = QComboBox()
-        self.material_dropdown.addItems(materials_list)
+        self.material_dropdown.setModel(get_shared_list_model("materials", materials_list))
+        self.material_dropdown.activated.connect(self.clear_unlisted_material)
         layout.addWidget(self.material_dropdown)
 
         checkbox_container = QHBoxLayout()
@@ -613,7 +1203,15 @@ class ColorRow(QWidget):
     def open_color_picker(self):
         color = QColorDialog.getColor()
         if color.isValid():
-            self.color_picker.setStyleSheet(f'background-color: {color.name()};')
+            self.set_color(color)
+
+    def set_color(self, color):
+        # Kept separately from the stylesheet, which would drop the alpha
+        self.color = QColor(color)
+        self.color_picker.setStyleSheet(f'background-color: {color.name()};')
+
+    def clear_unlisted_material(self):
+        self.unlisted_material = None
 
     def set_row_type(self, row_type):
         if row_type == "full":
@@ -621,8 +1219,7 @@ class ColorRow(QWidget):
             self.pattern_checkbox.setVisible(True)
             self.pattern_checkbox_padder.setVisible(True)
         elif row_type == "device":
-            self.material_dropdown.clear()
-            self.material_dropdown.addItems(device_materials_list)
+            self.material_dropdown.setModel(get_shared_list_model("device_materials", device_materials_list))
             self.pattern_checkbox.setVisible(False)
             self.pattern_checkbox_padder.setVisible(False)
         elif row_type == "colors-only":
@@ -631,21 +1228,24 @@ class ColorRow(QWidget):
             self.pattern_checkbox_padder.setVisible(False)
 
     def import_settings(self, settings):
-        self.color_picker.setStyleSheet(f'background-color: {settings.color.name()};')
+        self.set_color(settings.color)
         if settings.material:
             if settings.material.isnumeric():
-                index = self.material_dropdown.findText(f"{settings.material} - ", flags=Qt.MatchFlag.MatchContains)
+                index = self.material_dropdown.findText(f"{settings.material} - ", flags=Qt.MatchFlag.MatchStartsWith)
             else:
                 index = self.material_dropdown.findText(settings.material, flags=Qt.MatchFlag.MatchContains)
             if index >= 0:
                 self.material_dropdown.setCurrentIndex(index)
+                self.unlisted_material = None
+            else:
+                self.unlisted_material = settings.material
         self.pattern_checkbox.setChecked(settings.pattern)
 
     def export_settings(self):
         return ColorRowData(
             self.label.text(),
-            QColor(self.color_picker.palette().button().color()),
-            self.material_dropdown.currentText(),
+            QColor(self.color),
+            self.unlisted_material if self.unlisted_material is not None else self.material_dropdown.currentText(),
             self.pattern_checkbox.isChecked()
         )
 
@@ -653,7 +1253,12 @@ class ColoringSection(QWidget):
     def __init__(self, name, parent=None):
         super().__init__(parent)
         self.name = name
+        # Dropdown values read from a design that aren't in their list, kept as is until the user picks another one
+        self.unlisted_values = {}
         self.initUI()
+        for dropdown in (self.pattern_dropdown, self.pattern_size_dropdown, self.weathering_dropdown):
+            dropdown.activated.connect(lambda _, dropdown=dropdown: self.unlisted_values.pop(dropdown, None))
+        self.import_settings(ColoringSectionData.default(name))
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -708,11 +1313,11 @@ class ColoringSection(QWidget):
         pattern_layout = QHBoxLayout()
         pattern_layout.addWidget(QLabel('Pattern number'))
         self.pattern_dropdown = QComboBox()
-        self.pattern_dropdown.addItems(pattern_list)  # Dummy options
+        self.pattern_dropdown.setModel(get_shared_list_model("patterns", pattern_list))
         pattern_layout.addWidget(self.pattern_dropdown)
         pattern_layout.addWidget(QLabel('Pattern Size'))
         self.pattern_size_dropdown = QComboBox()
-        self.pattern_size_dropdown.addItems(pattern_size_list)  # Dummy options
+        self.pattern_size_dropdown.setModel(get_shared_list_model("pattern_sizes", pattern_size_list))
         pattern_layout.addWidget(self.pattern_size_dropdown)
         coloring_layout.addLayout(pattern_layout)
 
@@ -731,7 +1336,7 @@ class ColoringSection(QWidget):
         weathering_layout = QHBoxLayout()
         weathering_layout.addWidget(QLabel('Weathering:'))
         self.weathering_dropdown = QComboBox()
-        self.weathering_dropdown.addItems(weathering_list)  # Dummy options
+        self.weathering_dropdown.setModel(get_shared_list_model("weathering", weathering_list))
         weathering_layout.addWidget(self.weathering_dropdown)
         weathering_layout.addWidget(QLabel(""))
         weathering_layout.addWidget(QLabel(""))
@@ -746,39 +1351,43 @@ class ColoringSection(QWidget):
         if color.isValid():
             button.setStyleSheet(f'background-color: {color.name()};')
 
+    def select_dropdown_value(self, dropdown:QComboBox, value):
+        index = dropdown.findText(str(value), flags=Qt.MatchFlag.MatchContains)
+        if index >= 0:
+            dropdown.setCurrentIndex(index)
+            self.unlisted_values.pop(dropdown, None)
+        else:
+            self.unlisted_values[dropdown] = value
+
+    def get_dropdown_value(self, dropdown:QComboBox):
+        return self.unlisted_values.get(dropdown, dropdown.currentText())
+
     def import_settings(self, settings):
         for i, color_row_settings in enumerate(settings.color_rows):
             if i < len(self.color_rows):
                 self.color_rows[i].import_settings(color_row_settings)
 
-        index = self.pattern_dropdown.findText(str(settings.pattern_number), flags=Qt.MatchFlag.MatchContains)
-        if index >= 0:
-            self.pattern_dropdown.setCurrentIndex(index)
-
-        index = self.pattern_size_dropdown.findText(str(settings.pattern_size), flags=Qt.MatchFlag.MatchContains)
-        if index >= 0:
-            self.pattern_size_dropdown.setCurrentIndex(index)
+        self.select_dropdown_value(self.pattern_dropdown, settings.pattern_number)
+        self.select_dropdown_value(self.pattern_size_dropdown, settings.pattern_size)
 
         for i, color in enumerate(settings.pattern_colors):
             if i < len(self.pattern_color_rows):
-                self.pattern_color_rows[i].import_settings(ColorRowData(f"Pattern Color {i+1}", color))
+                self.pattern_color_rows[i].import_settings(ColorRowData(pattern_color_labels[i], color))
 
-        index = self.weathering_dropdown.findText(str(settings.weathering), flags=Qt.MatchFlag.MatchContains)
-        if index >= 0:
-            self.weathering_dropdown.setCurrentIndex(index)
+        self.select_dropdown_value(self.weathering_dropdown, settings.weathering)
 
     def export_settings(self):
         settings = ColoringSectionData(self.name_label.text())
         for color_row in self.color_rows:
             settings.color_rows.append(color_row.export_settings())
 
-        settings.pattern_size = self.pattern_size_dropdown.currentText()
-        settings.pattern_number = self.pattern_dropdown.currentText()
+        settings.pattern_size = self.get_dropdown_value(self.pattern_size_dropdown)
+        settings.pattern_number = self.get_dropdown_value(self.pattern_dropdown)
 
         for pattern_color_row in self.pattern_color_rows:
-            settings.pattern_colors.append(QColor(pattern_color_row.color_picker.palette().button().color()))
+            settings.pattern_colors.append(QColor(pattern_color_row.color))
 
-        settings.weathering = self.weathering_dropdown.currentText()
+        settings.weathering = self.get_dropdown_value(self.weathering_dropdown)
 
         return settings
 
@@ -872,6 +1481,474 @@ def process_coloring_bytes(coloring_bytes):
     return coloring_sections
 
 
+# Batch Coloring codec. numpy is only imported when one of these is used.
+coloring_record_size = 68
+coloring_record_count = 14
+coloring_chunk_size = coloring_record_size * coloring_record_count
+# Which of the 14 records each entry of color_section_labels is, the rest are the unknown sections
+coloring_section_records = [0, 1, 2, 3, 4, 5, 8, 12, 13]
+
+def get_coloring_dtype():
+    """
+    numpy structured dtype matching one 68 byte Coloring record (see ColoringSectionData).
+    """
+    import numpy as np
+    return np.dtype([
+        ('unk00', '<u4'),
+        ('weathering', '<i2'),
+        ('unk06', '<u2'),
+        ('colors', 'u1', (6, 4)),  # RGBA for Main, Sub, Support, Optional, Other, Device
+        ('materials', '<i2', (6,)),
+        ('pattern', 'u1'),
+        ('pattern_size', 'u1'),
+        ('unk2e', '<u2'),
+        ('pattern_colors', 'u1', (4, 4)),
+        ('flags', '<u2'),  # unk40, the low 5 bits are cleared when the pattern applies to that color
+        ('unk42', '<u2')
+    ])
+
+def decode_coloring_chunks(coloring_chunks):
+    """
+    Decode the Coloring chunks of many designs at once.
+    :param coloring_chunks: List of Coloring chunk bytes, as returned by read_section_value (trailing zeroes may be stripped)
+    :return: A (N, 14) array of get_coloring_dtype() records
+    """
+    import numpy as np
+    joined = b"".join(bytes(chunk[:coloring_chunk_size]).ljust(coloring_chunk_size, b"\x00") for chunk in coloring_chunks)
+    return np.frombuffer(joined, dtype=get_coloring_dtype()).reshape(len(coloring_chunks), coloring_record_count).copy()
+
+def encode_coloring_chunks(records) -> List[bytes]:
+    """
+    Inverse of decode_coloring_chunks.
+    :param records: A (N, 14) array of get_coloring_dtype() records
+    :return: List of Coloring chunk bytes
+    """
+    import numpy as np
+    data = np.ascontiguousarray(records, dtype=get_coloring_dtype()).tobytes()
+    return [data[i:i + coloring_chunk_size] for i in range(0, len(data), coloring_chunk_size)]
+
+def decode_designs_coloring(designs):
+    """
+    Decode the Coloring chunk of many decompressed designs at once. Designs without one get an all-zero row.
+    """
+    chunks = []
+    for design_bytes in designs:
+        section = read_section_value(design_bytes, b'Coloring')
+        chunks.append(section[1] if section else b"")
+    return decode_coloring_chunks(chunks)
+
+def get_pattern_enabled(records):
+    """
+    :return: A (..., 5) bool array of whether the pattern applies to Main, Sub, Support, Optional and Other
+    """
+    import numpy as np
+    return ((records['flags'][..., np.newaxis] >> np.arange(5)) & 1) == 0
+
+def set_pattern_enabled(records, pattern_enabled):
+    import numpy as np
+    bits = (~np.asarray(pattern_enabled, dtype=bool)).astype(np.uint16) << np.arange(5, dtype=np.uint16)
+    records['flags'] = (records['flags'] & ~np.uint16(0x1F)) | bits.sum(axis=-1, dtype=np.uint16)
+
+def get_palette_statistics(records, top=10):
+    """
+    Count the most used colors over a collection, only looking at the records the game actually uses.
+    :return: A list of ((r, g, b, a), count), most used first
+    """
+    import numpy as np
+    colors = records[..., coloring_section_records]['colors'].reshape(-1, 4)
+    packed = colors.astype(np.uint32) @ np.array([1 << 24, 1 << 16, 1 << 8, 1], dtype=np.uint32)
+    values, counts = np.unique(packed, return_counts=True)
+    order = np.argsort(counts)[::-1][:top]
+    return [(((int(value) >> 24) & 0xFF, (int(value) >> 16) & 0xFF, (int(value) >> 8) & 0xFF, int(value) & 0xFF), int(count))
+            for value, count in zip(values[order], counts[order])]
+
+
+# Batch Assemble codec, the array counterpart of process_assemble_bytes/equipment_id_to_save_id.
+# An Assemble chunk is 16 little-endian save IDs: the 7 parts, an FF separator, then 8 weapon slots.
+assemble_slot_count = 16
+assemble_chunk_size = assemble_slot_count * 4
+assemble_empty_id = 0xFFFFFFFF
+assemble_category_mask = 0xF0000000
+# The category every slot has to be in, None for the separator and the unused slots
+assemble_slot_categories = ["body_part"] * 4 + ["booster", "generator", "fcs", None] + ["weapon"] * 4 + [None] * 3 + ["weapon"]
+# Which slot each entry of design_slots is
+assemble_equipment_slots = [0, 1, 2, 3, 4, 5, 6, 8, 9, 10, 11, 15]
+# What generate_design_from_ui always writes to the slots the editor doesn't expose
+assemble_fixed_slots = {7: assemble_empty_id, 12: 299300, 13: 299100, 14: assemble_empty_id}
+
+def decode_assemble_chunks(assemble_chunks):
+    """
+    Decode the Assemble chunks of many designs at once.
+    :param assemble_chunks: List of Assemble chunk bytes, as returned by read_section_value (trailing zeroes may be stripped)
+    :return: A (N, 16) uint32 array of raw save IDs
+    """
+    import numpy as np
+    joined = b"".join(bytes(chunk[:assemble_chunk_size]).ljust(assemble_chunk_size, b"\x00") for chunk in assemble_chunks)
+    return np.frombuffer(joined, dtype='<u4').reshape(len(assemble_chunks), assemble_slot_count).astype(np.uint32)
+
+def encode_assemble_chunks(save_ids) -> List[bytes]:
+    """
+    Inverse of decode_assemble_chunks.
+    :param save_ids: A (N, 16) array of raw save IDs
+    :return: List of Assemble chunk bytes
+    """
+    import numpy as np
+    data = np.ascontiguousarray(save_ids, dtype='<u4').tobytes()
+    return [data[i:i + assemble_chunk_size] for i in range(0, len(data), assemble_chunk_size)]
+
+def decode_designs_assemble(designs):
+    """
+    Decode the Assemble chunk of many decompressed designs at once. Designs without one get an all-zero row.
+    """
+    chunks = []
+    for design_bytes in designs:
+        section = read_section_value(design_bytes, b'Assemble')
+        chunks.append(section[1] if section else b"")
+    return decode_assemble_chunks(chunks)
+
+def get_assemble_category_offsets():
+    """
+    :return: A (16,) int64 array of the CATEGORY_OFFSETS value each slot must have, -1 for the slots without a category
+    """
+    import numpy as np
+    return np.array([CATEGORY_OFFSETS[category] if category else -1 for category in assemble_slot_categories], dtype=np.int64)
+
+def get_assemble_empty(save_ids):
+    """
+    :return: A (..., 16) bool array of which slots hold the FF sentinel
+    """
+    return save_ids == assemble_empty_id
+
+def get_assemble_category_mismatches(save_ids):
+    """
+    :return: A (..., 16) bool array of the non-empty equipment slots whose category bits don't match the slot
+    """
+    import numpy as np
+    expected = get_assemble_category_offsets()
+    categories = (save_ids & np.uint32(assemble_category_mask)).astype(np.int64)
+    return (categories != expected) & (expected != -1) & ~get_assemble_empty(save_ids)
+
+def get_assemble_equipment_ids(save_ids):
+    """
+    Strip the category bits and pick out the slots in design_slots order, the same IDs get_design_metadata returns.
+    :return: A (..., 12) int32 array of equipment IDs, -1 where empty
+    """
+    import numpy as np
+    equipment_slots = save_ids[..., assemble_equipment_slots]
+    equipment_ids = (equipment_slots & np.uint32(~assemble_category_mask & 0xFFFFFFFF)).astype(np.int32)
+    return np.where(get_assemble_empty(equipment_slots), -1, equipment_ids)
+
+def build_assemble_save_ids(equipment_ids):
+    """
+    Inverse of get_assemble_equipment_ids, filling in the separator and fixed slots the same way generate_design_from_ui does.
+    :param equipment_ids: A (N, 12) array of equipment IDs in design_slots order, -1 where empty
+    :return: A (N, 16) uint32 array of raw save IDs
+    """
+    import numpy as np
+    equipment_ids = np.asarray(equipment_ids, dtype=np.int64).reshape(-1, len(assemble_equipment_slots))
+    offsets = get_assemble_category_offsets()[assemble_equipment_slots]
+    save_ids = np.empty((len(equipment_ids), assemble_slot_count), dtype=np.uint32)
+    save_ids[:, assemble_equipment_slots] = np.where(equipment_ids == -1, assemble_empty_id, equipment_ids + offsets)
+    for slot, value in assemble_fixed_slots.items():
+        save_ids[:, slot] = value
+    return save_ids
+
+def get_equipment_statistics(equipment_ids, top=10):
+    """
+    Count the most used equipment per slot over a collection.
+    :param equipment_ids: A (N, 12) array as returned by get_assemble_equipment_ids
+    :return: A dict of design_slots entry -> list of (equipment_id, count), most used first. Empty slots are left out.
+    """
+    import numpy as np
+    statistics = {}
+    for idx, slot in enumerate(design_slots):
+        column = equipment_ids[:, idx]
+        values, counts = np.unique(column[column != -1], return_counts=True)
+        order = np.argsort(counts)[::-1][:top]
+        statistics[slot] = [(int(value), int(count)) for value, count in zip(values[order], counts[order])]
+    return statistics
+
+
+# Batch validation against the parts.json catalogue
+design_slot_groups = ["Protectors"] * 4 + ["Internals"] * 3 + ["Weapons"] * 5
+# Slots the editor lets you leave empty (tank legs have no booster)
+design_optional_slots = ["Booster", "LHand", "RHand", "LBack", "RBack", "CExpansion"]
+validation_problems = {
+    "no_assemble": "Design has no Assemble chunk",
+    "bad_separator": "Bad separator bytes",
+    "wrong_category": "Save ID category doesn't match the slot",
+    "missing": "Required slot is empty",
+    "unknown_id": "ID not in the loaded parts",
+    "wrong_slot": "ID belongs to a different slot",
+}
+
+def get_catalogue_keys(parts_data):
+    """
+    Flatten parts_data into sorted int64 keys for np.isin, one set keyed by (slot, ID) and one by (group, ID).
+    """
+    import numpy as np
+    group_names = list(parts_data.keys())
+    slot_keys, group_keys = [], []
+    for slot_idx, (slot, group) in enumerate(zip(design_slots, design_slot_groups)):
+        for part in parts_data[group][slot]:
+            slot_keys.append((slot_idx << 32) | int(part['ID']))
+            group_keys.append((group_names.index(group) << 32) | int(part['ID']))
+    return np.unique(np.array(slot_keys, dtype=np.int64)), np.unique(np.array(group_keys, dtype=np.int64))
+
+def validate_designs(designs, parts_data) -> List[tuple]:
+    """
+    Check the assembled equipment of many decompressed designs against the catalogue in one pass.
+    :param parts_data: The parts.json dict
+    :return: A list of (design index, slot or None, equipment ID or None, problem), problem being a key of validation_problems
+    """
+    import numpy as np
+    chunks = [read_section_value(design_bytes, b'Assemble') for design_bytes in designs]
+    save_ids = decode_assemble_chunks([chunk[1] if chunk else b"" for chunk in chunks])
+    has_assemble = np.array([chunk is not None for chunk in chunks], dtype=bool)
+    equipment_ids = get_assemble_equipment_ids(save_ids).astype(np.int64)
+    empty = equipment_ids == -1
+
+    slot_keys, group_keys = get_catalogue_keys(parts_data)
+    group_names = list(parts_data.keys())
+    slot_indices = np.arange(len(design_slots), dtype=np.int64)
+    group_indices = np.array([group_names.index(group) for group in design_slot_groups], dtype=np.int64)
+    in_slot = np.isin((slot_indices << 32) | equipment_ids, slot_keys)
+    in_group = np.isin((group_indices << 32) | equipment_ids, group_keys)
+    optional = np.isin(np.array(design_slots), design_optional_slots)
+
+    # Per-design problems only get reported once, and hide the per-slot ones which would just be noise
+    design_masks = {
+        "no_assemble": ~has_assemble,
+        "bad_separator": has_assemble & (save_ids[:, 7] != assemble_empty_id),
+    }
+    broken = design_masks["no_assemble"] | design_masks["bad_separator"]
+    slot_masks = {
+        "wrong_category": get_assemble_category_mismatches(save_ids)[:, assemble_equipment_slots],
+        "missing": empty & ~optional,
+        "unknown_id": ~empty & ~in_group,
+        "wrong_slot": ~empty & in_group & ~in_slot,
+    }
+
+    problems = []
+    for problem, mask in design_masks.items():
+        problems.extend((int(design_idx), None, None, problem) for design_idx in np.flatnonzero(mask))
+    for problem, mask in slot_masks.items():
+        for design_idx, slot_idx in np.argwhere(mask & ~broken[:, np.newaxis]):
+            problems.append((int(design_idx), design_slots[slot_idx], int(equipment_ids[design_idx, slot_idx]), problem))
+    problems.sort(key=lambda problem: problem[0])
+    return problems
+
+def format_validation_report(problems, labels, max_lines=200) -> str:
+    """
+    :param labels: A label for every validated design, used to name them in the report
+    """
+    counts = {}
+    for _, _, _, problem in problems:
+        counts[problem] = counts.get(problem, 0) + 1
+    bad_designs = len({design_idx for design_idx, _, _, _ in problems})
+    lines = [f"{bad_designs} of {len(labels)} designs have problems."]
+    lines.extend(f"{validation_problems[problem]}: {count}" for problem, count in counts.items())
+    lines.append("")
+    for design_idx, slot, equipment_id, problem in problems[:max_lines]:
+        location = f" ({slot} {equipment_id})" if slot else ""
+        lines.append(f"{labels[design_idx]}: {validation_problems[problem]}{location}")
+    if len(problems) > max_lines:
+        lines.append(f"... and {len(problems) - max_lines} more")
+    return "\n".join(lines)
+
+
+# Batch recoloring. Operations are plain dicts (so they can be stored as JSON), applied in order:
+#   {"op": "set_color", "sections": [...], "colors": [...], "rgba": [r, g, b, a]}
+#   {"op": "hue_shift", "sections": [...], "colors": [...], "degrees": 30}
+#   {"op": "swap_material", "sections": [...], "colors": [...], "from": 5, "to": 12}  ("from" is optional)
+#   {"op": "set_pattern", "sections": [...], "pattern": 3, "pattern_size": 1, "colors": [...]}  (every key besides op is optional, "colors" lists the colors the pattern applies to)
+#   {"op": "set_weathering", "sections": [...], "weathering": 4}
+#   {"op": "copy_section", "source": "Core", "sections": [...]}
+# "sections" are color_section_labels (all of them if omitted), "colors" are color_labels (all of them if omitted).
+# set_color and hue_shift also take pattern_color_labels in "colors". hue_shift shifts every pattern color if "colors" is omitted.
+
+def get_operation_records(operation) -> List[int]:
+    sections = operation.get("sections") or color_section_labels
+    return [coloring_section_records[color_section_labels.index(section)] for section in sections]
+
+def get_operation_colors(operation) -> List[int]:
+    colors = operation.get("colors") or color_labels
+    return [color_labels.index(color) for color in colors if color not in pattern_color_labels]
+
+def get_operation_pattern_colors(operation, default=()) -> List[int]:
+    colors = operation.get("colors")
+    if not colors:
+        return list(default)
+    return [pattern_color_labels.index(color) for color in colors if color in pattern_color_labels]
+
+def shift_hue(rgba, degrees):
+    """
+    Rotate the hue of an (..., 4) uint8 RGBA array, keeping saturation, value and alpha.
+    """
+    import numpy as np
+    rgb = rgba[..., :3].astype(np.float32) / 255
+    max_value = rgb.max(axis=-1)
+    delta = max_value - rgb.min(axis=-1)
+    safe_delta = np.where(delta == 0, 1, delta)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    hue = np.select([max_value == r, max_value == g], [((g - b) / safe_delta) % 6, (b - r) / safe_delta + 2], (r - g) / safe_delta + 4)
+    hue = np.where(delta == 0, 0, hue)
+    hue = (hue + degrees / 60) % 6
+
+    # Back from HSV, using the same value and chroma
+    x = delta * (1 - np.abs(hue % 2 - 1))
+    sector = hue.astype(np.int32)
+    zero = np.zeros_like(delta)
+    candidates = np.stack([
+        np.stack([delta, x, zero], axis=-1),
+        np.stack([x, delta, zero], axis=-1),
+        np.stack([zero, delta, x], axis=-1),
+        np.stack([zero, x, delta], axis=-1),
+        np.stack([x, zero, delta], axis=-1),
+        np.stack([delta, zero, x], axis=-1)
+    ], axis=-2)
+    shifted = np.take_along_axis(candidates, sector[..., np.newaxis, np.newaxis], axis=-2)[..., 0, :]
+    shifted += (max_value - delta)[..., np.newaxis]
+
+    result = rgba.copy()
+    result[..., :3] = np.clip(np.rint(shifted * 255), 0, 255).astype(np.uint8)
+    return result
+
+def apply_coloring_operations(records, operations):
+    """
+    Apply recolor operations to a (N, 14) array from decode_coloring_chunks, in place.
+    """
+    import numpy as np
+    for operation in operations:
+        op = operation["op"]
+        record_indices = get_operation_records(operation)
+        if op == "copy_section":
+            source = coloring_section_records[color_section_labels.index(operation["source"])]
+            for record_index in record_indices:
+                if record_index != source:
+                    records[:, record_index] = records[:, source]
+            continue
+
+        selected = records[:, record_indices]
+        if op == "set_color":
+            color_indices = get_operation_colors(operation)
+            selected['colors'][:, :, color_indices] = np.array(operation["rgba"], dtype=np.uint8)
+            pattern_indices = get_operation_pattern_colors(operation)
+            selected['pattern_colors'][:, :, pattern_indices] = np.array(operation["rgba"], dtype=np.uint8)
+        elif op == "hue_shift":
+            color_indices = get_operation_colors(operation)
+            selected['colors'][:, :, color_indices] = shift_hue(selected['colors'][:, :, color_indices], operation["degrees"])
+            pattern_indices = get_operation_pattern_colors(operation, default=range(len(pattern_color_labels)))
+            selected['pattern_colors'][:, :, pattern_indices] = shift_hue(selected['pattern_colors'][:, :, pattern_indices], operation["degrees"])
+        elif op == "swap_material":
+            color_indices = get_operation_colors(operation)
+            materials = selected['materials'][:, :, color_indices]
+            if "from" in operation:
+                materials[materials == operation["from"]] = operation["to"]
+            else:
+                materials[...] = operation["to"]
+            selected['materials'][:, :, color_indices] = materials
+        elif op == "set_pattern":
+            if "pattern" in operation:
+                selected['pattern'] = operation["pattern"]
+            if "pattern_size" in operation:
+                selected['pattern_size'] = operation["pattern_size"]
+            if "colors" in operation:
+                enabled = np.zeros(selected.shape + (5,), dtype=bool)
+                enabled[..., [idx for idx in get_operation_colors(operation) if idx < 5]] = True
+                set_pattern_enabled(selected, enabled)
+        elif op == "set_weathering":
+            selected['weathering'] = operation["weathering"]
+        else:
+            raise ValueError(f"Unknown coloring operation: {op}")
+        records[:, record_indices] = selected
+    return records
+
+def replace_coloring_chunk(design_bytes, coloring_chunk) -> bytes:
+    """
+    Overwrite the Coloring chunk of a decompressed design, leaving every other byte untouched.
+    """
+    start_index = design_bytes.find(b'Coloring')
+    if start_index == -1:
+        raise ValueError("Coloring section not found.")
+    chunk_header = ChunkHeader.from_bytes(design_bytes[start_index:start_index + 0x20])
+    value_start = start_index + 0x20
+    new_value = coloring_chunk[:chunk_header.length]
+    return design_bytes[:value_start] + new_value + design_bytes[value_start + len(new_value):]
+
+def recolor_designs(designs, operations) -> (List[bytes], List[int]):
+    """
+    Apply recolor operations to many decompressed designs, decoding and encoding their Coloring chunks in one go.
+    Designs without a Coloring chunk are passed through unchanged rather than failing the whole batch.
+    :return: A tuple of (the designs, indices of the ones passed through unchanged)
+    """
+    records = decode_designs_coloring(designs)
+    apply_coloring_operations(records, operations)
+    recolored = []
+    skipped = []
+    for idx, (design_bytes, chunk) in enumerate(zip(designs, encode_coloring_chunks(records))):
+        if design_bytes.find(b'Coloring') == -1:
+            skipped.append(idx)
+            recolored.append(design_bytes)
+        else:
+            recolored.append(replace_coloring_chunk(design_bytes, chunk))
+    return recolored, skipped
+
+def recolor_archive(input_path, output_path, operations, report=no_report) -> (int, List[int]):
+    """
+    Recolor every design in a DesignArchive into a new archive. Each design is recompressed exactly once,
+    and decompression/compression run on a thread pool (zlib releases the GIL).
+    Designs without a Coloring chunk are copied over unchanged.
+    :return: A tuple of (the amount of designs recolored, indices of the ones copied unchanged)
+    """
+    with DesignArchive(input_path) as archive:
+        report("Decompressing")
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            designs = list(executor.map(archive.read, range(len(archive))))
+
+    report("Recoloring")
+    recolored, skipped = recolor_designs(designs, operations)
+    with DesignArchive(output_path, truncate=True) as output_archive:
+        output_archive.append(recolored, report)
+    return len(recolored) - len(skipped), skipped
+
+def run_recolor_command(args) -> int:
+    """
+    Headless entry point: design_editor.py recolor <operations.json> <input> <output>
+    The input is either a .acda archive (output is a new archive) or a folder of .design files (output is a folder).
+    """
+    if len(args) != 3:
+        print("Usage: design_editor.py recolor <operations.json> <input .acda or folder of .design files> <output .acda or folder>")
+        return 1
+    operations_path, input_path, output_path = args
+    with open(operations_path, 'r') as file:
+        operations = json.load(file)
+
+    if input_path.lower().endswith(".acda"):
+        design_count, skipped = recolor_archive(input_path, output_path, operations)
+        skipped_labels = [f"#{idx}" for idx in skipped]
+    else:
+        filenames = [filename for filename in os.listdir(input_path) if filename.lower().endswith(".design")]
+        designs = []
+        for filename in filenames:
+            with open(os.path.join(input_path, filename), 'rb') as file:
+                file_content = file.read()
+            if file_content.startswith(b'ASMC'):
+                file_content = ASMC.from_bytes(file_content).decompress()
+            designs.append(file_content)
+
+        os.makedirs(output_path, exist_ok=True)
+        recolored, skipped = recolor_designs(designs, operations)
+        write_design_batch(output_path, list(zip(filenames, recolored)))
+        design_count = len(designs) - len(skipped)
+        skipped_labels = [filenames[idx] for idx in skipped]
+
+    print(f"Recolored {design_count} designs into {output_path}")
+    if skipped_labels:
+        print(f"Copied {len(skipped_labels)} designs without a Coloring section unchanged: {', '.join(skipped_labels)}")
+    return 0
+
+
 def read_section_value(data, start_marker, instance=0):
     start_index = -1
     instance_count = 0
@@ -908,9 +1985,16 @@ def convert_to_string(value_bytes):
         return None
 
 
-def get_all_designs_from_save(file_path):
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Copy the selected .sl2 file to the temporary directory
+def get_all_presets_from_save(file_path, report=no_report) -> Dict[str, List[Preset]]:
+    """
+    Get the presets in every tab of a save file. Their designs are still compressed.
+    :param file_path: Path to the .sl2 file
+    :param report: Progress callback, report(stage, current, total). See customWidgets.TaskThread
+    :return: A dict of {USER_DATA filename: [Preset]}
+    """
+    with scratch_space.workspace("read_sl2") as temp_dir:
+        # Copy the selected .sl2 file to the scratch directory
+        report("Unpacking")
         temp_sl2_path = os.path.join(temp_dir, os.path.basename(file_path))
         shutil.copy(file_path, temp_sl2_path)
 
@@ -927,26 +2011,1096 @@ def get_all_designs_from_save(file_path):
             filename = f"USER_DATA0{str(current_data).zfill(2)}"
             data_path = os.path.join(unpacked_path,filename)
             if os.path.exists(data_path):
+                report("Decrypting", current_data - 2, 5)
                 decrypt_file(data_path)
+                report("Parsing", current_data - 2, 5)
                 with open(data_path, "rb") as file:
                     data = file.read()
                     user_data = UserDesignData.from_bytes(data)
                     if filename not in all_presets:
                         all_presets[filename] = []
                     all_presets[filename].extend(user_data.presets)
-        all_designs = {}
+
+        return all_presets
+
+def get_all_designs_from_save(file_path, report=no_report):
+    """
+    Get the decompressed designs in every tab of a save file.
+    :param file_path: Path to the .sl2 file
+    :param report: Progress callback, see get_all_presets_from_save
+    :return: A dict of {USER_DATA filename: [decompressed design bytes]}
+    """
+    return decompress_presets(get_all_presets_from_save(file_path, report), report)
+
+def decompress_presets(all_presets:Dict[str, List[Preset]], report=no_report) -> Dict[str, List[bytes]]:
+    """
+    Decompress the designs returned by get_all_presets_from_save, keeping the same layout.
+    """
+    # zlib releases the GIL while decompressing, so this scales across threads
+    all_designs = {}
+    total_presets = sum(len(presets) for presets in all_presets.values())
+    decompressed_count = 0
+    with concurrent.futures.ThreadPoolExecutor() as executor:
         for filename, presets in all_presets.items():
-            all_designs[filename] = [x.design.decompress() for x in presets]
+            all_designs[filename] = []
+            for design_bytes in executor.map(lambda preset: preset.design.decompress(), presets):
+                report("Decompressing", decompressed_count, total_presets)
+                all_designs[filename].append(design_bytes)
+                decompressed_count += 1
+
+    return all_designs
+
+
+def get_design_metadata(design_bytes):
+    """
+    Pull the names and assembled parts out of a decompressed design.
+    :return: A tuple of (ugc_id, data_name, ac_name, equipment IDs), where the IDs are the 7 parts followed by the 5 weapons, -1 if empty/unknown
+    """
+    names = []
+    for marker in [b'UgcID', b'DataName', b'AcName']:
+        section = read_section_value(design_bytes, marker)
+        names.append(convert_to_string(section[1]) if section else "")
+
+    equipment_ids = [-1] * len(design_slots)
+    section = read_section_value(design_bytes, b'Assemble')
+    if section:
+        # read_section_value strips trailing zeroes, which a core expansion ID ends in, so this pads the chunk back out
+        equipment_ids = get_assemble_equipment_ids(decode_assemble_chunks([section[1]]))[0].tolist()
+    return names[0], names[1], names[2], tuple(equipment_ids)
+
+
+class DesignArchiveEntry:
+    # offset, length, sha1 of the decompressed design, 12 equipment IDs, then the lengths of the three names that follow
+    record_format = "<QI20s12iHHH"
+    record_size = struct.calcsize(record_format)
+
+    def __init__(self, offset, length, sha1, ugc_id, data_name, ac_name, equipment_ids):
+        self.offset = offset
+        self.length = length
+        self.sha1 = sha1
+        self.ugc_id = ugc_id
+        self.data_name = data_name
+        self.ac_name = ac_name
+        self.equipment_ids = tuple(equipment_ids)
+
+    def to_bytes(self):
+        names = [name.encode('utf-8') for name in (self.ugc_id, self.data_name, self.ac_name)]
+        record = struct.pack(self.record_format, self.offset, self.length, self.sha1, *self.equipment_ids, *[len(name) for name in names])
+        return record + b"".join(names)
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """
+        :return: A tuple of (entry, offset of the next record)
+        """
+        fields = struct.unpack_from(cls.record_format, data, offset)
+        offset += cls.record_size
+        names = []
+        for name_length in fields[15:18]:
+            names.append(bytes(data[offset:offset + name_length]).decode('utf-8'))
+            offset += name_length
+        return cls(fields[0], fields[1], fields[2], names[0], names[1], names[2], fields[3:15]), offset
+
+
+class DesignArchive:
+    """
+    Append-only file holding many ASMC-compressed designs. The index holding the offset, hash, names and parts of
+    every design is stored in segments after the payloads, so listing or reading a single design never touches the
+    others. Each append writes its payloads and a segment indexing only those, chained to the previous segment,
+    and only then updates the header to point at it. An interrupted append leaves the archive as it was, and the
+    index never takes more space than the entries it holds.
+    """
+    magic = b"ACDA"
+    version = 1
+    header_format = "<4sIQI"  # magic, version, offset of the last index segment (0 if none), entry count
+    header_size = struct.calcsize(header_format)
+    segment_format = "<QI"  # offset of the previous index segment (0 if none), entry count
+    segment_size = struct.calcsize(segment_format)
+
+    def __init__(self, path, truncate=False):
+        """
+        :param truncate: Start a new, empty archive even if the file already exists
+        """
+        self.path = path
+        self.entries: List[DesignArchiveEntry] = []
+        self.segment_offset = 0
+        self.file = None
+        self.mapped = None
+        if truncate or not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as file:
+                file.write(struct.pack(self.header_format, self.magic, self.version, 0, 0))
+        self.open()
+
+    def open(self):
+        import mmap
+        self.file = open(self.path, 'rb')
+        self.mapped = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_offset, entry_count = struct.unpack_from(self.header_format, self.mapped, 0)
+        if magic != self.magic:
+            raise ValueError(f"{self.path} is not a design archive")
+        if version != self.version:
+            raise ValueError(f"Unsupported design archive version {version}")
+
+        segments = []
+        segment_offset = index_offset
+        while segment_offset:
+            previous_offset, segment_count = struct.unpack_from(self.segment_format, self.mapped, segment_offset)
+            segments.append(self.read_entries(segment_offset + self.segment_size, segment_count))
+            segment_offset = previous_offset
+        self.entries = [entry for segment in reversed(segments) for entry in segment]
+        self.segment_offset = index_offset
+        if len(self.entries) != entry_count:
+            raise ValueError(f"{self.path} has a corrupted index")
+
+    def read_entries(self, offset, entry_count) -> List[DesignArchiveEntry]:
+        entries = []
+        for _ in range(entry_count):
+            entry, offset = DesignArchiveEntry.from_bytes(self.mapped, offset)
+            entries.append(entry)
+        return entries
+
+    def close(self):
+        if self.mapped:
+            self.mapped.close()
+            self.mapped = None
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def read_compressed(self, index) -> bytes:
+        entry = self.entries[index]
+        return self.mapped[entry.offset:entry.offset + entry.length]
+
+    def read(self, index) -> bytes:
+        compressed = self.read_compressed(index)
+        header = AsmcHeader.from_bytes(compressed[:16])
+        return zlib.decompress(compressed[16:16 + header.compressed_size])
+
+    def append(self, designs, report=no_report) -> List[DesignArchiveEntry]:
+        """
+        Add decompressed designs to the end of the archive.
+        """
+        # zlib releases the GIL, so compressing on a thread pool scales across cores
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            payloads = list(executor.map(lambda design_bytes: ASMC(design_bytes).to_bytes(), designs))
+
+        self.close()
+        new_entries = []
+        try:
+            with open(self.path, 'r+b') as file:
+                file.seek(0, os.SEEK_END)
+                for idx, (design_bytes, payload) in enumerate(zip(designs, payloads)):
+                    report("Writing", idx, len(designs))
+                    ugc_id, data_name, ac_name, equipment_ids = get_design_metadata(design_bytes)
+                    new_entries.append(DesignArchiveEntry(file.tell(), len(payload), hashlib.sha1(design_bytes).digest(),
+                                                          ugc_id, data_name, ac_name, equipment_ids))
+                    file.write(payload)
+
+                index_offset = file.tell()
+                file.write(struct.pack(self.segment_format, self.segment_offset, len(new_entries)))
+                file.write(b"".join(entry.to_bytes() for entry in new_entries))
+                file.flush()
+                os.fsync(file.fileno())
+
+                file.seek(0)
+                file.write(struct.pack(self.header_format, self.magic, self.version, index_offset, len(self.entries) + len(new_entries)))
+        finally:
+            self.open()
+        return new_entries
+
+
+def extract_design_features(designs):
+    """
+    Turn decompressed designs into feature vectors for DesignSimilarityIndex, using the same chunk parsing as read_sections.
+    :return: A tuple of ((N, 12) int32 equipment IDs in design_slots order, (N, 81) float32 palette), where the
+             palette is the Main, Sub and Support RGB of every section, scaled to 0-1
+    """
+    import numpy as np
+    equipment = get_assemble_equipment_ids(decode_designs_assemble(designs))
+    records = decode_designs_coloring(designs)[:, coloring_section_records]
+    palette = records['colors'][:, :, :3, :3].astype(np.float32).reshape(len(designs), -1) / 255
+    return equipment, palette
+
+
+class DesignSimilarityIndex:
+    """
+    Brute-force nearest neighbour index over design features. Every query compares against all designs at once
+    with numpy, which stays in the millisecond range for collections of around 100k designs.
+    The score is a weighted mix of the share of matching equipment slots and the palette distance, both 0-1.
+    """
+    palette_size = len(color_section_labels) * 3 * 3
+
+    def __init__(self, path=None):
+        import numpy as np
+        self.path = path
+        self.keys: List[str] = []
+        self.equipment = np.zeros((0, len(design_slots)), dtype=np.int32)
+        self.palette = np.zeros((0, self.palette_size), dtype=np.float32)
+        if path and os.path.exists(path):
+            with np.load(path) as data:
+                self.keys = data['keys'].tolist()
+                self.equipment = data['equipment']
+                self.palette = data['palette']
+        self.known_keys = set(self.keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, keys, designs):
+        """
+        Add designs under the given keys, skipping keys that are already present.
+        """
+        import numpy as np
+        new_items = [(key, design_bytes) for key, design_bytes in zip(keys, designs) if key not in self.known_keys]
+        if not new_items:
+            return
+        equipment, palette = extract_design_features([design_bytes for _, design_bytes in new_items])
+        self.keys.extend(key for key, _ in new_items)
+        self.known_keys.update(key for key, _ in new_items)
+        self.equipment = np.concatenate([self.equipment, equipment])
+        self.palette = np.concatenate([self.palette, palette])
+
+    def save(self):
+        import numpy as np
+        np.savez(self.path, keys=np.array(self.keys, dtype=str), equipment=self.equipment, palette=self.palette)
+
+    def query(self, design_bytes, top=10, equipment_weight=0.5) -> List[tuple]:
+        """
+        :return: A list of (key, score) for the most similar designs, best first
+        """
+        import numpy as np
+        if not self.keys:
+            return []
+        equipment, palette = extract_design_features([design_bytes])
+        equipment_score = (self.equipment == equipment).mean(axis=1)
+        palette_score = 1 - np.linalg.norm(self.palette - palette, axis=1) / np.sqrt(self.palette_size)
+        scores = equipment_weight * equipment_score + (1 - equipment_weight) * palette_score
+
+        top = min(top, len(scores))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        return [(self.keys[idx], float(scores[idx])) for idx in best]
+
+
+# The order equipment IDs come out of get_design_metadata in
+design_slots = ["Head", "Core", "Arms", "Legs", "Booster", "Generator", "FCS", "LHand", "RHand", "LBack", "RBack", "CExpansion"]
+
+class DesignStore:
+    """
+    Local store of every design seen in ingested saves (and their backups), kept once per unique design.
+    Designs are keyed by the SHA-1 of their decompressed data and kept in a DesignArchive, while an SQLite
+    database maps save -> tab -> index -> hash. Saves that haven't changed since they were last ingested are
+    skipped, and presets whose timestamp and size match what's already referenced are never decompressed.
+
+    The names (through FTS5) and the assembled equipment of every design are indexed as well, see search.
+    """
+    def __init__(self, folder=None):
+        self.folder = folder or os.path.join(TOOLS_FOLDER, "design_store")
+        os.makedirs(self.folder, exist_ok=True)
+        self.archive = DesignArchive(os.path.join(self.folder, "designs.acda"))
+        self.index_by_hash = {entry.sha1.hex(): idx for idx, entry in enumerate(self.archive.entries)}
+
+        import sqlite3
+        self.db = sqlite3.connect(os.path.join(self.folder, "store.db"))
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS saves (save TEXT PRIMARY KEY, size INTEGER, mtime REAL);
+            CREATE TABLE IF NOT EXISTS refs (save TEXT, tab TEXT, idx INTEGER, stamp BLOB, hash TEXT,
+                                             PRIMARY KEY (save, tab, idx));
+            CREATE INDEX IF NOT EXISTS refs_hash ON refs (hash);
+            CREATE TABLE IF NOT EXISTS designs (hash TEXT PRIMARY KEY, ugc_id TEXT, data_name TEXT, ac_name TEXT);
+            CREATE TABLE IF NOT EXISTS design_equipment (hash TEXT, slot TEXT, equipment_id INTEGER);
+            CREATE INDEX IF NOT EXISTS design_equipment_id ON design_equipment (equipment_id, slot);
+            CREATE VIRTUAL TABLE IF NOT EXISTS design_names USING fts5(hash UNINDEXED, ugc_id, data_name, ac_name);
+        """)
+
+        # Stores created before the search index existed get caught up here
+        indexed_count = self.db.execute("SELECT COUNT(*) FROM designs").fetchone()[0]
+        if indexed_count < len(self.index_by_hash):
+            self.index_entries(self.archive.entries)
+        self.similarity_index = None
+
+    def close(self):
+        self.db.close()
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def preset_stamp(preset:Preset) -> bytes:
+        # The preset's timestamp plus its compressed size tells whether a slot still holds the same design
+        return bytes(preset.date_time) + struct.pack("<I", len(preset.design.compressed_data))
+
+    def ingest_save(self, file_path, report=no_report) -> (int, int):
+        """
+        Add every design in a save to the store.
+        :return: A tuple of (new unique designs, designs in the save)
+        """
+        save_key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        known_save = self.db.execute("SELECT size, mtime FROM saves WHERE save = ?", (save_key,)).fetchone()
+        if known_save == (stat.st_size, stat.st_mtime):
+            design_count = self.db.execute("SELECT COUNT(*) FROM refs WHERE save = ?", (save_key,)).fetchone()[0]
+            return 0, design_count
+
+        all_presets = get_all_presets_from_save(file_path, report)
+        known_refs = {(tab, idx): (stamp, design_hash) for tab, idx, stamp, design_hash
+                      in self.db.execute("SELECT tab, idx, stamp, hash FROM refs WHERE save = ?", (save_key,))}
+
+        refs = []
+        changed_slots = []
+        for tab, presets in all_presets.items():
+            for idx, preset in enumerate(presets):
+                stamp = self.preset_stamp(preset)
+                known_ref = known_refs.get((tab, idx))
+                if known_ref and known_ref[0] == stamp:
+                    refs.append((save_key, tab, idx, stamp, known_ref[1]))
+                else:
+                    changed_slots.append((tab, idx, stamp, preset))
+
+        # Only the changed slots get decompressed and hashed
+        new_designs = {}
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            decompressed = executor.map(lambda slot: slot[3].design.decompress(), changed_slots)
+            for count, ((tab, idx, stamp, _), design_bytes) in enumerate(zip(changed_slots, decompressed)):
+                report("Hashing", count, len(changed_slots))
+                design_hash = hashlib.sha1(design_bytes).hexdigest()
+                if design_hash not in self.index_by_hash:
+                    new_designs[design_hash] = design_bytes
+                refs.append((save_key, tab, idx, stamp, design_hash))
+
+        self.add_designs(list(new_designs.values()), report)
+        with self.db:
+            self.db.execute("DELETE FROM refs WHERE save = ?", (save_key,))
+            self.db.executemany("INSERT INTO refs (save, tab, idx, stamp, hash) VALUES (?, ?, ?, ?, ?)", refs)
+            self.db.execute("INSERT OR REPLACE INTO saves (save, size, mtime) VALUES (?, ?, ?)", (save_key, stat.st_size, stat.st_mtime))
+        return len(new_designs), len(refs)
+
+    def ingest_archive(self, file_path, report=no_report) -> (int, int):
+        """
+        Add every design in a DesignArchive to the store. Its entries are referenced with the "archive" tab.
+        :return: A tuple of (new unique designs, designs in the archive)
+        """
+        archive_key = os.path.abspath(file_path)
+        refs = []
+        new_designs = {}
+        with DesignArchive(file_path) as archive:
+            for idx, entry in enumerate(archive.entries):
+                report("Reading", idx, len(archive))
+                design_hash = entry.sha1.hex()
+                if design_hash not in self.index_by_hash and design_hash not in new_designs:
+                    new_designs[design_hash] = archive.read(idx)
+                refs.append((archive_key, "archive", idx, b"", design_hash))
+
+        self.add_designs(list(new_designs.values()), report)
+        with self.db:
+            self.db.execute("DELETE FROM refs WHERE save = ?", (archive_key,))
+            self.db.executemany("INSERT INTO refs (save, tab, idx, stamp, hash) VALUES (?, ?, ?, ?, ?)", refs)
+        return len(new_designs), len(refs)
+
+    def add_designs(self, designs, report=no_report):
+        if not designs:
+            return
+        new_entries = self.archive.append(designs, report)
+        first_index = len(self.archive) - len(new_entries)
+        for offset, entry in enumerate(new_entries):
+            self.index_by_hash[entry.sha1.hex()] = first_index + offset
+        self.index_entries(new_entries)
+        similarity_index = self.get_similarity_index()
+        similarity_index.add([entry.sha1.hex() for entry in new_entries], designs)
+        similarity_index.save()
+
+    def get_similarity_index(self) -> DesignSimilarityIndex:
+        # Loaded on first use, and caught up with any designs stored before it existed
+        if self.similarity_index is None:
+            self.similarity_index = DesignSimilarityIndex(os.path.join(self.folder, "similarity.npz"))
+            missing_hashes = [design_hash for design_hash in self.index_by_hash if design_hash not in self.similarity_index.known_keys]
+            if missing_hashes:
+                self.similarity_index.add(missing_hashes, [self.read(design_hash) for design_hash in missing_hashes])
+                self.similarity_index.save()
+        return self.similarity_index
+
+    def find_similar(self, design_bytes, top=20) -> List[tuple]:
+        """
+        :return: A list of (hash, ugc_id, data_name, ac_name, score), most similar first
+        """
+        results = []
+        for design_hash, score in self.get_similarity_index().query(design_bytes, top):
+            names = self.db.execute("SELECT hash, ugc_id, data_name, ac_name FROM designs WHERE hash = ?", (design_hash,)).fetchone()
+            if names:
+                results.append(names + (score,))
+        return results
+
+    def index_entries(self, entries:List[DesignArchiveEntry]):
+        indexed_hashes = {row[0] for row in self.db.execute("SELECT hash FROM designs")}
+        with self.db:
+            for entry in entries:
+                design_hash = entry.sha1.hex()
+                if design_hash in indexed_hashes:
+                    continue
+                indexed_hashes.add(design_hash)
+                names = (design_hash, entry.ugc_id, entry.data_name, entry.ac_name)
+                self.db.execute("INSERT INTO designs (hash, ugc_id, data_name, ac_name) VALUES (?, ?, ?, ?)", names)
+                self.db.execute("INSERT INTO design_names (hash, ugc_id, data_name, ac_name) VALUES (?, ?, ?, ?)", names)
+                self.db.executemany("INSERT INTO design_equipment (hash, slot, equipment_id) VALUES (?, ?, ?)",
+                                    [(design_hash, slot, equipment_id) for slot, equipment_id in zip(design_slots, entry.equipment_ids)])
+
+    def search(self, text="", equipment=None, limit=500) -> List[tuple]:
+        """
+        Find designs by name and/or assembled equipment.
+        :param text: Words to look for in the UgcID, DataName and AcName (prefix matches)
+        :param equipment: List of (slot, equipment_id) that must all be present. The slot is one of design_slots,
+                          or None to match the ID in any slot
+        :param limit: Maximum amount of results
+        :return: A list of (hash, ugc_id, data_name, ac_name)
+        """
+        query = "SELECT hash, ugc_id, data_name, ac_name FROM designs WHERE 1"
+        params = []
+        words = [word.replace('"', '') for word in text.split()]
+        words = [word for word in words if word]
+        if words:
+            query += " AND hash IN (SELECT hash FROM design_names WHERE design_names MATCH ?)"
+            params.append(" ".join(f'"{word}"*' for word in words))
+        for slot, equipment_id in equipment or []:
+            if slot:
+                query += " AND hash IN (SELECT hash FROM design_equipment WHERE equipment_id = ? AND slot = ?)"
+                params.extend([equipment_id, slot])
+            else:
+                query += " AND hash IN (SELECT hash FROM design_equipment WHERE equipment_id = ?)"
+                params.append(equipment_id)
+        query += " ORDER BY ac_name, data_name LIMIT ?"
+        params.append(limit)
+        return self.db.execute(query, params).fetchall()
+
+    def read(self, design_hash) -> bytes:
+        return self.archive.read(self.index_by_hash[design_hash])
+
+    def get_refs(self, save=None) -> List[tuple]:
+        """
+        :return: A list of (save, tab, index, hash), optionally for a single save
+        """
+        if save:
+            return self.db.execute("SELECT save, tab, idx, hash FROM refs WHERE save = ? ORDER BY tab, idx", (os.path.abspath(save),)).fetchall()
+        return self.db.execute("SELECT save, tab, idx, hash FROM refs ORDER BY save, tab, idx").fetchall()
+
+
+def get_gear_table():
+    """
+    The 256 random values the rolling hash in get_chunk_boundaries adds per byte. Derived from SHA-256 so they never change.
+    """
+    import numpy as np
+    return np.array([int.from_bytes(hashlib.sha256(bytes([value])).digest()[:8], 'little') for value in range(256)], dtype=np.uint64)
+
+def get_chunk_boundaries(data, min_size=2048, max_size=65536, mask_bits=13, block_size=1024 * 1024) -> List[int]:
+    """
+    Split data into content-defined chunks, so an edit only changes the chunks around it rather than shifting all that follow.
+    A gear hash over the last 32 bytes is computed for every position at once with numpy, and positions where its
+    top mask_bits are all zero (every 8 KB on average) become candidate cut points.
+    :return: The end offset of every chunk
+    """
+    import numpy as np
+    window = 32
+    gear = get_gear_table()
+    mask = np.uint64(((1 << mask_bits) - 1) << (window - mask_bits))
+    values = np.frombuffer(data, dtype=np.uint8)
+
+    candidates = []
+    for start in range(0, len(values), block_size):
+        # Overlap the previous block so hashes at the block edge see their whole window
+        low = max(0, start - window + 1)
+        block = gear[values[low:start + block_size]]
+        hashes = np.zeros(len(block), dtype=np.uint64)
+        for shift in range(min(window, len(block))):
+            hashes[shift:] += block[:len(block) - shift] << np.uint64(shift)
+        candidates.append(np.flatnonzero((hashes[start - low:] & mask) == 0) + start + 1)
+    candidates = np.concatenate(candidates) if candidates else np.zeros(0, dtype=np.int64)
+
+    boundaries = []
+    last = 0
+    while last < len(values):
+        next_index = np.searchsorted(candidates, last + min_size)
+        boundary = int(candidates[next_index]) if next_index < len(candidates) else len(values)
+        last = min(boundary, last + max_size, len(values))
+        boundaries.append(last)
+    return boundaries
+
+
+class SaveBackupStore:
+    """
+    Deduplicated restore points for save files, replacing the full timestamped copies save_to_sl2 used to make.
+
+    The encrypted USER_DATA entries are located in the .sl2 and stored decrypted along with their IV. Since AES-CBC
+    is deterministic for a given IV, re-encrypting them gives back the exact original bytes. The plaintexts and the
+    rest of the file are split into content-defined chunks, and each chunk is stored zlib-compressed exactly once.
+    A new restore point therefore only costs the chunks that changed since any earlier one.
+    """
+    def __init__(self, folder=None):
+        self.folder = folder or os.path.join(TOOLS_FOLDER, "save_backups")
+        os.makedirs(self.folder, exist_ok=True)
+
+        import sqlite3
+        self.db = sqlite3.connect(os.path.join(self.folder, "backups.db"))
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS chunks (hash TEXT PRIMARY KEY, data BLOB);
+            CREATE TABLE IF NOT EXISTS backups (id INTEGER PRIMARY KEY AUTOINCREMENT, save TEXT, created REAL,
+                                                size INTEGER, sha1 TEXT, manifest TEXT);
+            CREATE INDEX IF NOT EXISTS backups_save ON backups (save, created);
+        """)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def store_chunks(self, data) -> (List[str], int):
+        """
+        :return: A tuple of (chunk hashes, compressed bytes actually written)
+        """
+        chunk_hashes = []
+        written_bytes = 0
+        start = 0
+        for end in get_chunk_boundaries(data):
+            chunk = data[start:end]
+            chunk_hash = hashlib.sha1(chunk).hexdigest()
+            if self.db.execute("SELECT 1 FROM chunks WHERE hash = ?", (chunk_hash,)).fetchone() is None:
+                compressed_chunk = zlib.compress(chunk, 6)
+                self.db.execute("INSERT INTO chunks (hash, data) VALUES (?, ?)", (chunk_hash, compressed_chunk))
+                written_bytes += len(compressed_chunk)
+            chunk_hashes.append(chunk_hash)
+            start = end
+        return chunk_hashes, written_bytes
+
+    def read_chunks(self, chunk_hashes) -> bytes:
+        data = BytesIO()
+        for chunk_hash in chunk_hashes:
+            row = self.db.execute("SELECT data FROM chunks WHERE hash = ?", (chunk_hash,)).fetchone()
+            if row is None:
+                raise ValueError(f"Backup chunk {chunk_hash} is missing")
+            data.write(zlib.decompress(row[0]))
+        return data.getvalue()
+
+    @staticmethod
+    def find_encrypted_entries(save_bytes, unpacked_path) -> List[tuple]:
+        """
+        Find where the still-encrypted USER_DATA files of an unpacked save sit in the .sl2 and decrypt them.
+        :return: A list of (offset, IV, plaintext), sorted by offset. Entries that can't be found are left out.
+        """
+        from Crypto.Cipher import AES
+        entries = []
+        for filename in sorted(os.listdir(unpacked_path)):
+            if not filename.startswith("USER_DATA"):
+                continue
+            with open(os.path.join(unpacked_path, filename), 'rb') as file:
+                encrypted = file.read()
+            if len(encrypted) < 32 or len(encrypted) % 16 != 0:
+                continue
+            # The IV plus the first block are random enough to only occur once
+            offset = save_bytes.find(encrypted[:32])
+            if offset == -1 or save_bytes[offset:offset + len(encrypted)] != encrypted:
+                continue
+            plaintext = AES.new(sl2_encryption_key, AES.MODE_CBC, encrypted[:16]).decrypt(encrypted[16:])
+            entries.append((offset, encrypted[:16], plaintext))
+
+        entries.sort(key=lambda entry: entry[0])
+        # Drop anything overlapping an earlier entry rather than risk a broken restore
+        non_overlapping = []
+        for entry in entries:
+            if not non_overlapping or entry[0] >= non_overlapping[-1][0] + 16 + len(non_overlapping[-1][2]):
+                non_overlapping.append(entry)
+        return non_overlapping
+
+    @staticmethod
+    def assemble(skeleton, entries) -> bytes:
+        """
+        Put the re-encrypted entries back into the rest of the file.
+        """
+        from Crypto.Cipher import AES
+        output = BytesIO()
+        skeleton_position = 0
+        for offset, iv, plaintext in entries:
+            gap = offset - output.tell()
+            output.write(skeleton[skeleton_position:skeleton_position + gap])
+            skeleton_position += gap
+            output.write(iv)
+            output.write(AES.new(sl2_encryption_key, AES.MODE_CBC, iv).encrypt(plaintext))
+        output.write(skeleton[skeleton_position:])
+        return output.getvalue()
+
+    def add_backup(self, file_path, unpacked_path=None, report=no_report) -> (int, int):
+        """
+        :param unpacked_path: The save as unpacked by run_witchy, before decryption. Without it the file is stored as is,
+                              which still deduplicates but can't look inside the encrypted entries.
+        :return: A tuple of (backup id, compressed bytes written)
+        """
+        report("Backing up")
+        with open(file_path, 'rb') as file:
+            save_bytes = file.read()
+        entries = self.find_encrypted_entries(save_bytes, unpacked_path) if unpacked_path else []
+
+        skeleton = BytesIO()
+        position = 0
+        for offset, iv, plaintext in entries:
+            skeleton.write(save_bytes[position:offset])
+            position = offset + 16 + len(plaintext)
+        skeleton.write(save_bytes[position:])
+        if self.assemble(skeleton.getvalue(), entries) != save_bytes:
+            # Never keep a restore point that wouldn't give back the exact file
+            entries = []
+            skeleton = BytesIO(save_bytes)
+
+        skeleton_chunks, written_bytes = self.store_chunks(skeleton.getvalue())
+        manifest = {"skeleton": skeleton_chunks, "entries": []}
+        for idx, (offset, iv, plaintext) in enumerate(entries):
+            report("Backing up", idx, len(entries))
+            entry_chunks, entry_written_bytes = self.store_chunks(plaintext)
+            manifest["entries"].append({"offset": offset, "iv": iv.hex(), "chunks": entry_chunks})
+            written_bytes += entry_written_bytes
+
+        cursor = self.db.execute("INSERT INTO backups (save, created, size, sha1, manifest) VALUES (?, ?, ?, ?, ?)",
+                                 (os.path.abspath(file_path), time.time(), len(save_bytes), hashlib.sha1(save_bytes).hexdigest(), json.dumps(manifest)))
+        self.db.commit()
+        print(f"Backed up {file_path}: {written_bytes / 1024:.1f} KB written for a {len(save_bytes) / 1024 / 1024:.1f} MB save")
+        return cursor.lastrowid, written_bytes
+
+    def list_backups(self, file_path) -> List[tuple]:
+        """
+        :return: A list of (backup id, creation timestamp, size), newest first
+        """
+        return self.db.execute("SELECT id, created, size FROM backups WHERE save = ? ORDER BY created DESC",
+                               (os.path.abspath(file_path),)).fetchall()
+
+    def read_backup(self, backup_id) -> bytes:
+        row = self.db.execute("SELECT sha1, manifest FROM backups WHERE id = ?", (backup_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"No backup with id {backup_id}")
+        sha1, manifest = row[0], json.loads(row[1])
+        entries = [(entry["offset"], bytes.fromhex(entry["iv"]), self.read_chunks(entry["chunks"])) for entry in manifest["entries"]]
+        save_bytes = self.assemble(self.read_chunks(manifest["skeleton"]), entries)
+        if hashlib.sha1(save_bytes).hexdigest() != sha1:
+            raise ValueError(f"Backup {backup_id} doesn't match its checksum")
+        return save_bytes
+
+    def restore(self, backup_id, output_path):
+        save_bytes = self.read_backup(backup_id)
+        with open(f"{output_path}.tmp", 'wb') as file:
+            file.write(save_bytes)
+        os.replace(f"{output_path}.tmp", output_path)
+
+def backup_save(file_path, report=no_report) -> (int, int):
+    """
+    Add a restore point for a save, unpacking it first so its encrypted entries deduplicate.
+    Falls back to storing the file as is if WitchyBND isn't available.
+    """
+    with scratch_space.workspace("backup_sl2") as temp_dir, SaveBackupStore() as backup_store:
+        temp_sl2_path = os.path.join(temp_dir, os.path.basename(file_path))
+        shutil.copy(file_path, temp_sl2_path)
+        file_parts = os.path.splitext(os.path.basename(file_path))
+        unpacked_path = os.path.join(temp_dir, f"{file_parts[0]}-{file_parts[1][1:]}")
+        try:
+            run_witchy(temp_sl2_path)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Couldn't unpack {file_path} for the backup, storing it as is: {e}")
+            unpacked_path = None
+        return backup_store.add_backup(file_path, unpacked_path, report)
+
+def run_restore_command(args) -> int:
+    """
+    Headless entry point: design_editor.py restore <save> [backup id] [output]
+    Lists the restore points of a save, or restores one (over the save itself unless an output is given).
+    """
+    if len(args) not in (1, 2, 3):
+        print("Usage: design_editor.py restore <.sl2> [backup id] [output .sl2]")
+        return 1
+    file_path = args[0]
+    with SaveBackupStore() as backup_store:
+        if len(args) == 1:
+            for backup_id, created, size in backup_store.list_backups(file_path):
+                print(f"{backup_id:6} {datetime.datetime.fromtimestamp(created):%Y-%m-%d %H:%M:%S} {size / 1024 / 1024:8.1f} MB")
+            return 0
+        output_path = args[2] if len(args) == 3 else file_path
+        if os.path.exists(output_path):
+            # Restoring shouldn't lose the current state either
+            backup_save(output_path)
+        backup_store.restore(int(args[1]), output_path)
+    print(f"Restored backup {args[1]} to {output_path}")
+    return 0
+
+
+def design_export_filename(prefix, idx, design_bytes) -> str:
+    _, data_name_bytes = read_section_value(design_bytes, b'DataName')
+    _, ac_name_bytes = read_section_value(design_bytes, b'AcName')
+    data_name = convert_to_string(data_name_bytes).replace(" ", "_")
+    ac_name = convert_to_string(ac_name_bytes).replace(" ", "_")
+    design_filename = f"{prefix}[{idx}]_({data_name}_{ac_name}).design"
+    return ''.join(c for c in design_filename if c.isalnum() or c in ['_', '-', "[", "]", ".", "(", ")"])  # Sanitize filename
+
+def deduplicate_filenames(filenames) -> List[str]:
+    """
+    Add a counter to any filename that collides with an earlier one. Comparison is case-insensitive,
+    since that's how the filesystem will see them on Windows.
+    """
+    seen = set()
+    unique_filenames = []
+    for filename in filenames:
+        candidate = filename
+        counter = 1
+        while candidate.lower() in seen:
+            stem, extension = os.path.splitext(filename)
+            candidate = f"{stem}_{counter}{extension}"
+            counter += 1
+        seen.add(candidate.lower())
+        unique_filenames.append(candidate)
+    return unique_filenames
+
+def write_design_batch(output_dir, batch) -> int:
+    for filename, design_bytes in batch:
+        with open(os.path.join(output_dir, filename), 'wb') as design_file:
+            design_file.write(design_bytes)
+    return len(batch)
+
+# mode: (label, file extension)
+export_modes = {
+    "files": ("Separate .design files", None),
+    "zip": ("Single .zip file", "zip"),
+    "archive": ("Indexed design archive", "acda")
+}
+
+def export_designs(entries, output_path, mode="files", report=no_report, batch_size=64) -> List[str]:
+    """
+    Write out designs under sanitized filenames, making sure none of them collide.
+    :param entries: List of (filename prefix, index, decompressed design bytes)
+    :param output_path: The output folder, or the archive path for the other modes
+    :param mode: One of the keys of export_modes
+    :param report: Progress callback, see get_all_designs_from_save
+    :param batch_size: How many files each write job handles
+    :return: The filenames used, in the same order as entries
+    """
+    report("Naming")
+    filenames = deduplicate_filenames([design_export_filename(prefix, idx, design_bytes) for prefix, idx, design_bytes in entries])
+    files = [(filename, entry[2]) for filename, entry in zip(filenames, entries)]
+
+    if mode == "zip":
+        import zipfile
+        with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+            for idx, (filename, design_bytes) in enumerate(files):
+                report("Writing", idx, len(files))
+                zip_file.writestr(filename, design_bytes)
+    elif mode == "archive":
+        with DesignArchive(output_path, truncate=True) as archive:
+            archive.append([design_bytes for _, design_bytes in files], report)
+    elif mode == "files":
+        os.makedirs(output_path, exist_ok=True)
+        batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+        executor = concurrent.futures.ThreadPoolExecutor()
+        try:
+            futures = [executor.submit(write_design_batch, output_path, batch) for batch in batches]
+            written_count = 0
+            for future in concurrent.futures.as_completed(futures):
+                written_count += future.result()
+                report("Writing", written_count, len(files))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    else:
+        raise ValueError(f"Unknown export mode: {mode}")
+
+    return filenames
+
+
+# List of .param files to process
+param_files = [
+    'EquipParamProtector.param',
+    'EquipParamWeapon.param',
+    'EquipParamFcs.param',
+    'EquipParamGenerator.param',
+    'EquipParamBooster.param'
+]
 
-        return all_designs
+def extract_param_rows(param_path):
+    """
+    Filter the rows of a .param file that has already been unpacked with run_witchy. Can run in a worker process, so it only takes and returns plain data.
+    :param param_path: Path to the .param file inside the unpacked regulation.bin
+    :return: A tuple of (param filename, list of (part_id, part_name, part_types))
+    """
+    import xmltodict
+    param_file = os.path.basename(param_path)
+
+    with open(f'{param_path}.xml', 'r') as xml_file:
+        xml_data = xmltodict.parse(xml_file.read())
+    rows = xml_data['param']['rows']['row']
+    if isinstance(rows, dict):  # A single row doesn't get wrapped in a list
+        rows = [rows]
+
+    extracted_rows = []
+    for row in rows:
+        part_types = []
+        if param_file == "EquipParamProtector.param":
+            if row.get('@headEquip') == '1':
+                part_types.append('Head')
+            if row.get('@bodyEquip') == '1':
+                part_types.append('Core')
+            if row.get('@armEquip') == '1':
+                part_types.append('Arms')
+            if row.get('@legEquip') == '1':
+                part_types.append('Legs')
+        elif param_file == "EquipParamWeapon.param":
+            if row.get('@equipFrontRightSlot') == '1':
+                part_types.append('RHand')
+            if row.get('@equipFrontLeftSlot') == '1':
+                part_types.append('LHand')
+            if row.get('@equipBackRightSlot') == '1':
+                part_types.append('RBack')
+            if row.get('@equipBackLeftSlot') == '1':
+                part_types.append('LBack')
+            if row.get('@coreExpansionEffect_Display') is not None:
+                part_types.append("CExpansion")
+        extracted_rows.append((row['@id'], row.get('@paramdexName', ''), part_types))
+
+    return param_file, extracted_rows
+
+def merge_param_rows(parts_data, param_file, rows):
+    """
+    Merge the rows returned by extract_param_rows into parts_data.
+    """
+    if param_file in ["EquipParamProtector.param", "EquipParamWeapon.param"]:
+        group = "Protectors" if param_file == "EquipParamProtector.param" else "Weapons"
+        # Index the existing parts by ID rather than scanning every category for each row
+        existing_parts = {}
+        for category in parts_data[group].values():
+            for part in category:
+                existing_parts.setdefault(part['ID'], part)
+
+        for part_id, part_name, part_types in rows:
+            existing_part = existing_parts.get(part_id)
+            if existing_part:
+                # Update the part name
+                existing_part['Name'] = part_name
+                # Remove the part from categories where it shouldn't be
+                for category, parts in parts_data[group].items():
+                    if category not in part_types and existing_part in parts:
+                        parts.remove(existing_part)
+            else:
+                # Add the part to the appropriate categories
+                for part_type in part_types:
+                    new_part = {'ID': part_id, 'Name': part_name}
+                    parts_data[group][part_type].append(new_part)
+                    existing_parts.setdefault(part_id, new_part)
+
+    else:
+        category = param_file.replace("EquipParam", "").replace(".param", "")
+        if category.upper() == "FCS": category = category.upper()
+        existing_parts = {part['ID']: part for part in parts_data['Internals'][category]}
+        for part_id, part_name, _ in rows:
+            existing_part = existing_parts.get(part_id)
+            if existing_part:
+                # Update the part name
+                existing_part['Name'] = part_name
+            else:
+                # Add the part to the appropriate category
+                new_part = {'ID': part_id, 'Name': part_name}
+                parts_data['Internals'][category].append(new_part)
+                existing_parts[part_id] = new_part
+
+def iter_completed_with_progress(futures, label, parent=None):
+    """
+    Yield futures as they complete while showing a progress dialog and keeping the event loop running.
+    """
+    progress = QtWidgets.QProgressDialog(label, None, 0, len(futures), parent)
+    progress.setWindowTitle("Working")
+    progress.setWindowModality(Qt.WindowModality.WindowModal)
+    progress.setMinimumDuration(0)
+    progress.setValue(0)
+
+    pending = set(futures)
+    completed = 0
+    try:
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=0.05, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                completed += 1
+                progress.setValue(completed)
+                yield future
+            QApplication.processEvents()
+    finally:
+        progress.close()
+
+
+class PresetGalleryModel(QtCore.QAbstractListModel):
+    """
+    List model of (label, ACThumbnail). Thumbnails are only decoded when the view asks for them,
+    which with uniform item sizes is only for the tiles that are actually on screen.
+    """
+    def __init__(self, entries, parent=None):
+        super().__init__(parent)
+        self.entries = entries
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        label, thumbnail = self.entries[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return label
+        if role == Qt.ItemDataRole.DecorationRole:
+            return thumbnail_cache.get(thumbnail)
+        return None
+
+
+class PresetGalleryDialog(QtWidgets.QDialog):
+    def __init__(self, labels, thumbnails, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Select Design")
+        self.selected_index = None
+
+        layout = QVBoxLayout()
+        self.view = QtWidgets.QListView()
+        self.view.setViewMode(QtWidgets.QListView.ViewMode.IconMode)
+        self.view.setResizeMode(QtWidgets.QListView.ResizeMode.Adjust)
+        self.view.setMovement(QtWidgets.QListView.Movement.Static)
+        self.view.setUniformItemSizes(True)
+        self.view.setLayoutMode(QtWidgets.QListView.LayoutMode.Batched)
+        self.view.setIconSize(QSize(ACThumbnail.width, ACThumbnail.height))
+        self.view.setGridSize(QSize(ACThumbnail.width + 16, ACThumbnail.height + 36))
+        self.view.setWordWrap(True)
+        self.view.setModel(PresetGalleryModel(list(zip(labels, thumbnails)), self.view))
+        self.view.doubleClicked.connect(self.choose)
+        layout.addWidget(self.view)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        load_button = QPushButton("Load")
+        load_button.clicked.connect(lambda: self.choose(self.view.currentIndex()))
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(load_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        self.resize((ACThumbnail.width + 16) * 3 + 40, 600)
+
+    def choose(self, index):
+        if index.isValid():
+            self.selected_index = index.row()
+            self.accept()
+
+
+class DesignSearchDialog(QtWidgets.QDialog):
+    def __init__(self, editor):
+        super().__init__(editor)
+        self.editor = editor
+        self.store = DesignStore()
+        self.results = []
+        self.setWindowTitle("Search design store")
+
+        layout = QVBoxLayout()
+        text_layout = QHBoxLayout()
+        text_layout.addWidget(QLabel("AcName/DataName/UgcID:"))
+        self.text_field = QLineEdit()
+        self.text_field.textChanged.connect(self.update_results)
+        text_layout.addWidget(self.text_field)
+        layout.addLayout(text_layout)
+
+        layout.addWidget(QLabel("Must use the currently selected:"))
+        slots_layout = QGridLayout()
+        self.slot_checkboxes = []
+        for idx, slot in enumerate(design_slots):
+            slot_layout = QHBoxLayout()
+            checkbox = CustomCheckBox()
+            checkbox.toggled.connect(self.update_results)
+            slot_layout.addWidget(checkbox)
+            slot_layout.addWidget(QLabel(slot))
+            slots_layout.addLayout(slot_layout, idx // 6, idx % 6)
+            self.slot_checkboxes.append(checkbox)
+        layout.addLayout(slots_layout)
+
+        similar_button = QPushButton("Find designs similar to the current one")
+        similar_button.clicked.connect(self.show_similar)
+        layout.addWidget(similar_button)
+
+        self.results_list = QtWidgets.QListWidget()
+        self.results_list.itemDoubleClicked.connect(self.load_result)
+        layout.addWidget(self.results_list)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.setLayout(layout)
+        self.resize(700, 500)
+        self.update_results()
+
+    def current_equipment_id(self, idx):
+        fields = self.editor.part_fields + self.editor.weapon_fields
+        try:
+            return int(fields[idx].currentText().split(' ')[0])
+        except ValueError:
+            return None
+
+    def update_results(self):
+        equipment = []
+        for idx, checkbox in enumerate(self.slot_checkboxes):
+            equipment_id = self.current_equipment_id(idx)
+            if checkbox.isChecked() and equipment_id is not None:
+                equipment.append((design_slots[idx], equipment_id))
+
+        start_time = time.perf_counter()
+        self.results = self.store.search(self.text_field.text(), equipment)
+        elapsed = time.perf_counter() - start_time
+
+        self.results_list.clear()
+        self.results_list.addItems([f"{ac_name} // {data_name} ({ugc_id})" for _, ugc_id, data_name, ac_name in self.results])
+        self.status_label.setText(f"{len(self.results)} designs found in {elapsed * 1000:.1f} ms. Double click one to load it.")
+
+    def show_similar(self):
+        current_design = self.editor.generate_design_from_ui()
+        start_time = time.perf_counter()
+        similar = self.store.find_similar(current_design)
+        elapsed = time.perf_counter() - start_time
+
+        self.results = [result[:4] for result in similar]
+        self.results_list.clear()
+        self.results_list.addItems([f"{score:.0%} - {ac_name} // {data_name} ({ugc_id})" for _, ugc_id, data_name, ac_name, score in similar])
+        self.status_label.setText(f"{len(similar)} similar designs found in {elapsed * 1000:.1f} ms. Double click one to load it.")
+
+    def load_result(self, item):
+        design_hash = self.results[self.results_list.row(item)][0]
+        chosen_design = self.store.read(design_hash)
+        self.editor.read_sections(chosen_design)
+        self.editor.userimage_textbox.setText("Loaded from design store")
+        self.editor.stored_original_design = chosen_design
+        self.accept()
+
+    def done(self, result):
+        self.store.close()
+        super().done(result)
 
 
 class DesignDecompressor(QWidget):
     def __init__(self):
         super().__init__()
         self.current_section = 0
-        self.coloring_sections:List[ColoringSection] = []
-        self.initUI()
+        # Coloring sections are only built when first needed, until then their settings live in coloring_section_data
+        self.coloring_sections:List[Union[ColoringSection, None]] = [None] * len(color_section_labels)
+        self.coloring_section_data:List[Union[ColoringSectionData, None]] = [None] * len(color_section_labels)
+        self.update_check_thread:Union[ToolUpdateCheckThread, None] = None
+        with startup_trace.stage("initUI"):
+            self.initUI()
 
     def initUI(self):
         self.setWindowTitle('Design Editor')
@@ -1027,6 +3181,7 @@ class DesignDecompressor(QWidget):
                      ['Arms', 'Legs'],
                      ['Booster', 'Generator', 'FCS']]
         self.part_fields = []
+        self.part_models = []
         for part_row in part_rows:
             row_layout = QHBoxLayout()
             for idx, part_name in enumerate(part_row):
@@ -1037,10 +3192,9 @@ class DesignDecompressor(QWidget):
                 part_field = QComboBox()
                 part_field.setEditable(True)
                 part_field.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
-                completer = part_field.completer()
-                completer.setFilterMode(Qt.MatchFlag.MatchContains)
-                completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-                completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+                part_model = SlotItemModel(self)
+                attach_shared_model(part_field, part_model)
+                self.part_models.append(part_model)
 
                 part_field.setMaximumWidth(400)  # Set a maximum width for the part comboboxes
                 part_layout.addWidget(part_field)
@@ -1070,6 +3224,7 @@ class DesignDecompressor(QWidget):
             ['Core Expansion']
         ]
         self.weapon_fields = []
+        self.weapon_models = []
         for weapon_row in weapon_rows:
             row_layout = QHBoxLayout()
             for weapon_name in weapon_row:
@@ -1083,11 +3238,9 @@ class DesignDecompressor(QWidget):
                 weapon_field.setMaximumWidth(400)  # Set a maximum width for the part comboboxes
                 weapon_field.setEditable(True)
                 weapon_field.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
-
-                completer = weapon_field.completer()
-                completer.setFilterMode(Qt.MatchFlag.MatchContains)
-                completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-                completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+                weapon_model = SlotItemModel(self)
+                attach_shared_model(weapon_field, weapon_model)
+                self.weapon_models.append(weapon_model)
 
                 weapon_layout.addWidget(weapon_field)
                 row_layout.addLayout(weapon_layout)
@@ -1098,7 +3251,8 @@ class DesignDecompressor(QWidget):
             weapons_layout.addLayout(row_layout)
         layout.addLayout(weapons_layout)
 
-        self.import_regbin("resources/regulation.bin")
+        with startup_trace.stage("regulation import"):
+            self.import_regbin("resources/regulation.bin")
 
         # Navigation row
         nav_layout = QHBoxLayout()
@@ -1127,10 +3281,9 @@ class DesignDecompressor(QWidget):
         layout.addLayout(copy_all_layout)
         # Create coloring sections
         self.coloring_stack = QStackedWidget()
-        for name in color_section_labels:
-            section = ColoringSection(name)
-            self.coloring_sections.append(section)
-            self.coloring_stack.addWidget(section)
+        for _ in color_section_labels:
+            self.coloring_stack.addWidget(QWidget())  # Placeholder, replaced in get_coloring_section
+        self.get_coloring_section(0)
         layout.addWidget(self.coloring_stack)
 
 
@@ -1180,6 +3333,12 @@ class DesignDecompressor(QWidget):
         import_regbin_button.clicked.connect(self.import_regbin)
         extract_all_button = QPushButton("Extract designs from .sl2")
         extract_all_button.clicked.connect(self.dump_designs)
+        store_designs_button = QPushButton("Add .sl2 to design store")
+        store_designs_button.clicked.connect(self.store_designs)
+        search_store_button = QPushButton("Search design store")
+        search_store_button.clicked.connect(lambda: DesignSearchDialog(self).exec())
+        validate_designs_button = QPushButton("Validate designs")
+        validate_designs_button.clicked.connect(self.check_designs)
 
         bottom_row_layout.addWidget(load_from_file_button)
         bottom_row_layout.addWidget(load_from_save_button)
@@ -1187,12 +3346,18 @@ class DesignDecompressor(QWidget):
         bottom_row_layout.addWidget(QLabel(""))
         bottom_row_layout.addWidget(import_regbin_button)
         bottom_row_layout.addWidget(extract_all_button)
+        bottom_row_layout.addWidget(store_designs_button)
+        bottom_row_layout.addWidget(search_store_button)
+        bottom_row_layout.addWidget(validate_designs_button)
         bottom_row_layout.addWidget(QLabel(""))
 
         save_design_button = QPushButton('Save .design')
         save_design_button.clicked.connect(self.save_design_file)
         save_to_sl2_button = QPushButton('Save to .sl2')
         save_to_sl2_button.clicked.connect(self.save_to_sl2)
+        restore_backup_button = QPushButton('Restore .sl2 backup')
+        restore_backup_button.clicked.connect(self.restore_backup)
+        bottom_row_layout.addWidget(restore_backup_button)
         bottom_row_layout.addWidget(save_to_sl2_button)
         bottom_row_layout.addWidget(save_design_button)
         self.root_layout.addLayout(bottom_row_layout)
@@ -1244,7 +3409,38 @@ class DesignDecompressor(QWidget):
             self.current_section += 1
             self.update_section()
 
+    def get_coloring_section(self, index) -> ColoringSection:
+        section = self.coloring_sections[index]
+        if section is None:
+            section = ColoringSection(color_section_labels[index])
+            if self.coloring_section_data[index] is not None:
+                section.import_settings(self.coloring_section_data[index])
+                self.coloring_section_data[index] = None
+
+            # Inserting and removing pages moves the current index around, so put it back afterwards
+            current_index = self.coloring_stack.currentIndex()
+            placeholder = self.coloring_stack.widget(index)
+            self.coloring_stack.insertWidget(index, section)
+            self.coloring_stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.coloring_stack.setCurrentIndex(current_index)
+            self.coloring_sections[index] = section
+        return section
+
+    def import_section_settings(self, index, settings:ColoringSectionData):
+        if self.coloring_sections[index] is not None:
+            self.coloring_sections[index].import_settings(settings)
+        else:
+            self.coloring_section_data[index] = settings
+
+    def export_section_settings(self, index) -> ColoringSectionData:
+        # Sections that were never built export the same settings their widgets would, without building them
+        if self.coloring_sections[index] is None:
+            return self.coloring_section_data[index] or ColoringSectionData.default(color_section_labels[index])
+        return self.coloring_sections[index].export_settings()
+
     def update_section(self):
+        self.get_coloring_section(self.current_section)
         self.coloring_stack.setCurrentIndex(self.current_section)
         if self.current_section > 0:
             self.prev_button.setStyleSheet(f"font-weight: bold; background-color: {colors_dict['toggle_color']}")
@@ -1259,13 +3455,12 @@ class DesignDecompressor(QWidget):
         self.next_button.setEnabled(self.current_section < len(color_section_labels) - 1)
 
     def copy_to_all_sections(self):
-        current_section = self.coloring_sections[self.current_section]
-        settings = current_section.export_settings()
+        settings = self.export_section_settings(self.current_section)
 
-        for i, section in enumerate(self.coloring_sections):
+        for i, section_name in enumerate(color_section_labels):
             if i != self.current_section:
                 # Create a new settings object with the target section's name
-                new_settings = ColoringSectionData(section.name)
+                new_settings = ColoringSectionData(section_name)
                 # Copy all other settings from the current section
                 new_settings.color_rows = settings.color_rows
                 new_settings.pattern_number = settings.pattern_number
@@ -1273,7 +3468,7 @@ class DesignDecompressor(QWidget):
                 new_settings.pattern_colors = settings.pattern_colors
                 new_settings.weathering = settings.weathering
 
-                section.import_settings(new_settings)
+                self.import_section_settings(i, new_settings)
 
         QMessageBox.information(self, "Copy Complete", "Settings copied to all sections.")
 
@@ -1285,18 +3480,18 @@ class DesignDecompressor(QWidget):
             data = json.load(file)
             protectors = data["Protectors"]
             internals = data["Internals"]
-            for i, part_field in enumerate(self.part_fields):
-                part_field.clear()
+            for i, part_model in enumerate(self.part_models):
                 if i < 4:  # Head, Core, Arms, Legs
                     part_type = protector_types[i]
-                    filtered_parts = [f"{part['ID']} {part['Name']}" for part in protectors[part_type]]
+                    slot_parts = protectors[part_type]
                 else:  # Booster, Generator, FCS
                     part_type = inner_types[i-4]
-                    filtered_parts = [f"{part['ID']} {part['Name']}" for part in internals[part_type]]
-                if i == 4: part_field.addItem("-1 None")
+                    slot_parts = internals[part_type]
+                filtered_parts = [f"{part['ID']} {part['Name']}" for part in sorted(slot_parts, key=lambda part: int(part['ID']))]
+                if i == 4: filtered_parts.insert(0, "-1 None")
 
-                part_field.addItems(filtered_parts)
-                if i == 4: part_field.setCurrentIndex(1)
+                part_model.setStringList(filtered_parts)
+                if i == 4: self.part_fields[i].setCurrentIndex(1)
 
     def load_weapons(self):
         cwd = os.getcwd()
@@ -1304,12 +3499,10 @@ class DesignDecompressor(QWidget):
         with open("parts.json", 'r') as file:
             data = json.load(file)
             weapons = data["Weapons"]
-            for i, weapon_field in enumerate(self.weapon_fields):
-                weapon_field.clear()
+            for i, weapon_model in enumerate(self.weapon_models):
                 weapon_type = slots[i]
-                filtered_weapons = [f"{weapon['ID']} {weapon['Name']}" for weapon in weapons[weapon_type]]
-                weapon_field.addItem("-1 Empty")
-                weapon_field.addItems(filtered_weapons)
+                filtered_weapons = [f"{weapon['ID']} {weapon['Name']}" for weapon in sorted(weapons[weapon_type], key=lambda weapon: int(weapon['ID']))]
+                weapon_model.setStringList(["-1 Empty"] + filtered_weapons)
 
     def import_regbin(self, file_override=None):
         if file_override:
@@ -1331,7 +3524,7 @@ class DesignDecompressor(QWidget):
         else:
             file_path, _ = QFileDialog.getOpenFileName(self, 'Select regulation.bin', '', 'regulation.bin (regulation.bin)')
         if file_path:
-            with tempfile.TemporaryDirectory() as temp_dir:
+            with scratch_space.workspace("regulation") as temp_dir:
                 with open("parts.json", 'r') as file:
                     parts_data = json.load(file)
                 # Copy the regulation.bin file to the temporary directory
@@ -1340,123 +3533,24 @@ class DesignDecompressor(QWidget):
                 # Unpack regulation.bin
                 run_witchy(os.path.join(temp_dir, 'regulation.bin'), False)
 
-                # List of .param files to process
-                param_files = [
-                    'EquipParamProtector.param',
-                    'EquipParamWeapon.param',
-                    'EquipParamFcs.param',
-                    'EquipParamGenerator.param',
-                    'EquipParamBooster.param'
-                ]
-
-                for param_file in param_files:
-                    param_path = os.path.join(temp_dir, 'regulation-bin', param_file)
-                    xml_path = f'{param_path}.xml'
-
-                    # Unpack the .param file
-                    run_witchy(param_path, False)
-
-                    # Open and process the generated XML file
-                    with open(xml_path, 'r') as xml_file:
-                        xml_content = xml_file.read()
-                        xml_data = xmltodict.parse(xml_content)
-                        rows = xml_data['param']['rows']['row']
-                        if param_file == "EquipParamProtector.param":
-                            for row in rows:
-                                part_id = row['@id']
-                                part_name = row.get('@paramdexName', '')
-
-                                part_types = []
-                                if row.get('@headEquip') == '1':
-                                    part_types.append('Head')
-                                if row.get('@bodyEquip') == '1':
-                                    part_types.append('Core')
-                                if row.get('@armEquip') == '1':
-                                    part_types.append('Arms')
-                                if row.get('@legEquip') == '1':
-                                    part_types.append('Legs')
-
-                                # Check if the part already exists in parts_data
-                                existing_part = None
-                                for category in parts_data['Protectors'].values():
-                                    for part in category:
-                                        if part['ID'] == part_id:
-                                            existing_part = part
-                                            break
-                                    if existing_part:
-                                        break
-
-                                if existing_part:
-                                    # Update the part name
-                                    existing_part['Name'] = part_name
-                                    # Remove the part from categories where it shouldn't be
-                                    for category, parts in parts_data['Protectors'].items():
-                                        if category not in part_types and existing_part in parts:
-                                            parts.remove(existing_part)
-                                else:
-                                    # Add the part to the appropriate categories
-                                    for part_type in part_types:
-                                        parts_data['Protectors'][part_type].append({'ID': part_id, 'Name': part_name})
-
-                        elif param_file == "EquipParamWeapon.param":
-                            for row in rows:
-                                part_id = row['@id']
-                                part_name = row.get('@paramdexName', '')
-
-                                part_types = []
-                                if row.get('@equipFrontRightSlot') == '1':
-                                    part_types.append('RHand')
-                                if row.get('@equipFrontLeftSlot') == '1':
-                                    part_types.append('LHand')
-                                if row.get('@equipBackRightSlot') == '1':
-                                    part_types.append('RBack')
-                                if row.get('@equipBackLeftSlot') == '1':
-                                    part_types.append('LBack')
-                                if row.get('@coreExpansionEffect_Display') is not None:
-                                    part_types.append("CExpansion")
-
-                                # Check if the part already exists in parts_data
-                                existing_part = None
-                                for category in parts_data['Weapons'].values():
-                                    for part in category:
-                                        if part['ID'] == part_id:
-                                            existing_part = part
-                                            break
-                                    if existing_part:
-                                        break
-
-                                if existing_part:
-                                    # Update the part name
-                                    existing_part['Name'] = part_name
-                                    # Remove the part from categories where it shouldn't be
-                                    for category, parts in parts_data['Weapons'].items():
-                                        if category not in part_types and existing_part in parts:
-                                            parts.remove(existing_part)
-                                else:
-                                    # Add the part to the appropriate categories
-                                    for part_type in part_types:
-                                        parts_data['Weapons'][part_type].append({'ID': part_id, 'Name': part_name})
-
-                        elif param_file in ["EquipParamFcs.param", "EquipParamGenerator.param", "EquipParamBooster.param"]:
-                            category = param_file.replace("EquipParam", "").replace(".param", "")
-                            if category.upper() == "FCS": category = category.upper()
-                            for row in rows:
-                                part_id = row['@id']
-                                part_name = row.get('@paramdexName', '')
-
-                                # Check if the part already exists in parts_data
-                                existing_part = None
-                                for part in parts_data['Internals'][category]:
-                                    if part['ID'] == part_id:
-                                        existing_part = part
-                                        break
-
-                                if existing_part:
-                                    # Update the part name
-                                    existing_part['Name'] = part_name
-                                else:
-                                    # Add the part to the appropriate category
-                                    parts_data['Internals'][category].append({'ID': part_id, 'Name': part_name})
+                # Unpack all the .param files in one WitchyBND run, then filter them in parallel, merging them as they finish
+                param_folder = os.path.join(temp_dir, 'regulation-bin')
+                param_paths = [os.path.join(param_folder, param_file) for param_file in param_files]
+                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                    for future in iter_completed_with_progress([executor.submit(run_witchy, param_paths, False)], "Unpacking params...", self):
+                        future.result()
+                # The XML parsing is pure Python, so it needs separate processes to actually run in parallel. Each of those
+                # re-imports this module (and PyQt6) on Windows though, which startup can't afford, so the bundled
+                # regulation.bin is parsed one file at a time on a single thread instead.
+                if file_override:
+                    parse_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+                else:
+                    parse_executor = concurrent.futures.ProcessPoolExecutor(max_workers=min(len(param_files), os.cpu_count() or 1))
+                with parse_executor as executor:
+                    futures = [executor.submit(extract_param_rows, param_path) for param_path in param_paths]
+                    for future in iter_completed_with_progress(futures, "Extracting params...", self):
+                        param_file, rows = future.result()
+                        merge_param_rows(parts_data, param_file, rows)
 
                 # Check if msg/engus/item.msgbnd.dcx exists
                 msg_folder_path = os.path.join(os.path.dirname(file_path), 'msg')
@@ -1465,6 +3559,7 @@ class DesignDecompressor(QWidget):
 
                 msg_file_path = os.path.join(temp_dir, 'msg', 'engus', 'item.msgbnd.dcx')
                 if os.path.exists(msg_file_path):
+                    import xmltodict
                     # Unpack item.msgbnd.dcx
                     run_witchy(msg_file_path, True)
 
@@ -1504,7 +3599,7 @@ class DesignDecompressor(QWidget):
                 with open("parts.json", 'w') as file:
                     json.dump(parts_data, file, indent=4)
 
-                # Cleanup will be handled automatically by tempfile
+                # The scratch workspace gets cleared the next time it's used
                 self.load_parts()
                 self.load_weapons()
 
@@ -1541,50 +3636,183 @@ class DesignDecompressor(QWidget):
         if len(subdirs) == 1:
             default_dir = os.path.join(default_dir, subdirs[0])
 
-        file_path, _ = QFileDialog.getOpenFileName(self, 'Select File', default_dir, 'Save Files (*.sl2 *.mod);;All Files (*)')
-        if file_path:
-            all_designs = get_all_designs_from_save(file_path)
-            output_dir = QFileDialog.getExistingDirectory(self, "Select Output Directory")
-            for filename, design_list in all_designs.items():
-                for idx, design_bytes in enumerate(design_list):
-                    _, data_name_bytes = read_section_value(design_bytes, b'DataName')
-                    _, ac_name_bytes = read_section_value(design_bytes, b'AcName')
-                    data_name = convert_to_string(data_name_bytes).replace(" ", "_")
-                    ac_name = convert_to_string(ac_name_bytes).replace(" ", "_")
-                    # Create filename
-                    design_filename = f"{filename}[{idx}]_({data_name}_{ac_name}).design"
-                    design_filename = ''.join(c for c in design_filename if c.isalnum() or c in ['_', '-', "[", "]", ".", "(", ")"])  # Sanitize filename
-
-                    # Save the design file
-                    with open(os.path.join(output_dir, design_filename), 'wb') as design_file:
-                        design_file.write(design_bytes)
+        file_paths, _ = QFileDialog.getOpenFileNames(self, 'Select Files', default_dir, 'Save Files (*.sl2 *.mod);;All Files (*)')
+        if file_paths:
+            mode_labels = [label for label, _ in export_modes.values()]
+            mode_label, ok = QInputDialog.getItem(self, "Export Format", "Export designs as:", mode_labels, 0, False)
+            if not ok:
+                return
+            mode = list(export_modes.keys())[mode_labels.index(mode_label)]
+
+            if mode == "files":
+                output_path = QFileDialog.getExistingDirectory(self, "Select Output Directory")
+            else:
+                output_path, _ = QFileDialog.getSaveFileName(self, 'Save Archive', '', f'{mode_label} (*.{export_modes[mode][1]})')
+            if not output_path:
+                return
+
+            def extract(report):
+                entries = []
+                for file_path in file_paths:
+                    all_designs = get_all_designs_from_save(file_path, report)
+                    for filename, design_list in all_designs.items():
+                        # Prefix the save's name when exporting several saves together
+                        prefix = filename if len(file_paths) == 1 else f"{os.path.splitext(os.path.basename(file_path))[0]}_{filename}"
+                        entries.extend((prefix, idx, design_bytes) for idx, design_bytes in enumerate(design_list))
+                export_designs(entries, output_path, mode, report)
+
+            try:
+                TaskDialog("Extracting designs", extract, self).run()
+            except TaskCancelled:
+                return
             QMessageBox.information(self, "Extract Complete", f"All design files extracted.")
-    def load_from_save(self):
+    def store_designs(self):
+        appdata_path = os.path.expandvars("%AppData%")
+        default_dir = os.path.join(appdata_path, "ArmoredCore6")
+        subdirs = [d for d in os.listdir(default_dir) if os.path.isdir(os.path.join(default_dir, d))]
+        if len(subdirs) == 1:
+            default_dir = os.path.join(default_dir, subdirs[0])
+
+        file_paths, _ = QFileDialog.getOpenFileNames(self, 'Select Files', default_dir, 'Save Files (*.sl2 *.mod);;Design Archives (*.acda);;All Files (*)')
+        if file_paths:
+            def ingest(report):
+                new_count, total_count = 0, 0
+                with DesignStore() as store:
+                    for file_path in file_paths:
+                        if file_path.lower().endswith(".acda"):
+                            added, found = store.ingest_archive(file_path, report)
+                        else:
+                            added, found = store.ingest_save(file_path, report)
+                        new_count += added
+                        total_count += found
+                return new_count, total_count
+
+            try:
+                new_count, total_count = TaskDialog("Storing designs", ingest, self).run()
+            except TaskCancelled:
+                return
+            QMessageBox.information(self, "Store Complete", f"{total_count} designs found, {new_count} of them new.")
+
+    def check_designs(self):
+        appdata_path = os.path.expandvars("%AppData%")
+        default_dir = os.path.join(appdata_path, "ArmoredCore6")
+        subdirs = [d for d in os.listdir(default_dir) if os.path.isdir(os.path.join(default_dir, d))]
+        if len(subdirs) == 1:
+            default_dir = os.path.join(default_dir, subdirs[0])
+
+        file_paths, _ = QFileDialog.getOpenFileNames(self, 'Select Files', default_dir, 'Save Files (*.sl2 *.mod);;Design Archives (*.acda);;All Files (*)')
+        if file_paths:
+            def validate(report):
+                designs, labels = [], []
+                for file_path in file_paths:
+                    if file_path.lower().endswith(".acda"):
+                        with DesignArchive(file_path) as archive:
+                            for idx, entry in enumerate(archive.entries):
+                                report("Reading archive", idx, len(archive))
+                                designs.append(archive.read(idx))
+                                labels.append(f"{os.path.basename(file_path)}: {entry.ac_name} // {entry.data_name}")
+                    else:
+                        for filename, design_list in get_all_designs_from_save(file_path, report).items():
+                            for design_bytes in design_list:
+                                _, data_name, ac_name, _ = get_design_metadata(design_bytes)
+                                labels.append(f"{os.path.basename(file_path)}/{filename}: {ac_name} // {data_name}")
+                                designs.append(design_bytes)
+                report("Validating", 0, 1)
+                with open("parts.json", 'r') as file:
+                    parts_data = json.load(file)
+                return format_validation_report(validate_designs(designs, parts_data), labels)
+
+            try:
+                report_text = TaskDialog("Validating designs", validate, self).run()
+            except TaskCancelled:
+                return
+            message_box = QMessageBox(self)
+            message_box.setWindowTitle("Validation Report")
+            message_box.setText(report_text.split("\n\n")[0])
+            message_box.setDetailedText(report_text)
+            message_box.exec()
+
+    def restore_backup(self):
         appdata_path = os.path.expandvars("%AppData%")
         default_dir = os.path.join(appdata_path, "ArmoredCore6")
         subdirs = [d for d in os.listdir(default_dir) if os.path.isdir(os.path.join(default_dir, d))]
         if len(subdirs) == 1:
             default_dir = os.path.join(default_dir, subdirs[0])
         file_path, _ = QFileDialog.getOpenFileName(self, 'Select File', default_dir, 'Save Files (*.sl2 *.mod);;All Files (*)')
-        if file_path:
-            designs_dict = get_all_designs_from_save(file_path)
-            all_designs = []
-            for design_list in designs_dict.values():
-                all_designs.extend(design_list)
-
-            design_labels = []
-            for design in all_designs:
-                _, data_name_bytes = read_section_value(design, b'DataName')
-                _, ac_name_bytes = read_section_value(design, b'AcName')
-
-                data_name = convert_to_string(data_name_bytes)
-                ac_name = convert_to_string(ac_name_bytes)
-                design_labels.append(f"{ac_name} // {data_name}")
-
-            # Show a dialog with a dropdown listing the design labels
-            design_label, ok = QInputDialog.getItem(self, "Select Design", "Choose a design:", design_labels, 0, False)
-            if ok and design_label:
-                design_index = design_labels.index(design_label)
+        if not file_path:
+            return
+
+        with SaveBackupStore() as backup_store:
+            backups = backup_store.list_backups(file_path)
+        if not backups:
+            QMessageBox.information(self, "No Backups", "There are no backups of this save yet.")
+            return
+
+        backup_labels = [f"{datetime.datetime.fromtimestamp(created):%Y-%m-%d %H:%M:%S} ({size / 1024 / 1024:.1f} MB)" for _, created, size in backups]
+        backup_label, ok = QInputDialog.getItem(self, "Select Backup", "Restore the save as it was on:", backup_labels, 0, False)
+        if not ok or not backup_label:
+            return
+        backup_id = backups[backup_labels.index(backup_label)][0]
+
+        def restore(report):
+            # The current state gets a restore point too, so restoring can be undone
+            backup_save(file_path, report)
+            report("Restoring")
+            with SaveBackupStore() as backup_store:
+                backup_store.restore(backup_id, file_path)
+
+        try:
+            TaskDialog("Restoring backup", restore, self).run()
+        except TaskCancelled:
+            return
+        QMessageBox.information(self, "Restore Complete", f"The save has been restored to {backup_label}.")
+
+    def load_from_save(self):
+        appdata_path = os.path.expandvars("%AppData%")
+        default_dir = os.path.join(appdata_path, "ArmoredCore6")
+        subdirs = [d for d in os.listdir(default_dir) if os.path.isdir(os.path.join(default_dir, d))]
+        if len(subdirs) == 1:
+            default_dir = os.path.join(default_dir, subdirs[0])
+        file_path, _ = QFileDialog.getOpenFileName(self, 'Select File', default_dir, 'Save Files (*.sl2 *.mod);;Design Archives (*.acda);;All Files (*)')
+        if file_path and file_path.lower().endswith(".acda"):
+            # The archive index has the names already, only the chosen design gets decompressed
+            with DesignArchive(file_path) as archive:
+                design_labels = [f"{entry.ac_name} // {entry.data_name}" for entry in archive.entries]
+                design_label, ok = QInputDialog.getItem(self, "Select Design", "Choose a design:", design_labels, 0, False)
+                if ok and design_label:
+                    chosen_design = archive.read(design_labels.index(design_label))
+                    self.read_sections(chosen_design)
+                    self.userimage_textbox.setText("Loaded from archive")
+                    self.stored_original_design = chosen_design
+        elif file_path:
+            def load(report):
+                presets_dict = get_all_presets_from_save(file_path, report)
+                designs_dict = decompress_presets(presets_dict, report)
+                all_designs, thumbnails = [], []
+                for filename, design_list in designs_dict.items():
+                    all_designs.extend(design_list)
+                    thumbnails.extend(preset.thumbnail for preset in presets_dict[filename])
+
+                design_labels = []
+                for idx, design in enumerate(all_designs):
+                    report("Reading names", idx, len(all_designs))
+                    _, data_name_bytes = read_section_value(design, b'DataName')
+                    _, ac_name_bytes = read_section_value(design, b'AcName')
+
+                    data_name = convert_to_string(data_name_bytes)
+                    ac_name = convert_to_string(ac_name_bytes)
+                    design_labels.append(f"{ac_name} // {data_name}")
+                return all_designs, design_labels, thumbnails
+
+            try:
+                all_designs, design_labels, thumbnails = TaskDialog("Loading save", load, self).run()
+            except TaskCancelled:
+                return
+
+            # Show the thumbnails of every preset to pick from
+            gallery = PresetGalleryDialog(design_labels, thumbnails, self)
+            if gallery.exec() and gallery.selected_index is not None:
+                design_index = gallery.selected_index
                 chosen_design = all_designs[design_index]
                 self.read_sections(chosen_design)
                 self.userimage_textbox.setText("Loaded from .sl2")
@@ -1641,32 +3869,26 @@ class DesignDecompressor(QWidget):
             parts, weapons = process_assemble_bytes(assemble_bytes)
             if parts is not None and weapons is not None:
                 for i, (equipment_id, category) in enumerate(parts):
-                    match_found = False
-                    for index in range(self.part_fields[i].count()):
-                        if str(equipment_id) in self.part_fields[i].itemText(index):
-                            self.part_fields[i].setCurrentIndex(index)
-                            match_found = True
-                            break
-                    if not match_found:
+                    index = self.part_models[i].row_for_id(equipment_id)
+                    if index >= 0:
+                        self.part_fields[i].setCurrentIndex(index)
+                    else:
                         self.part_fields[i].setEditText(f"{equipment_id}")
 
                 for i, (equipment_id, category) in enumerate(weapons):
                     if i < len(self.weapon_fields):
-                        match_found = False
-                        for index in range(self.weapon_fields[i].count()):
-                            if str(equipment_id) in self.weapon_fields[i].itemText(index):
-                                self.weapon_fields[i].setCurrentIndex(index)
-                                match_found = True
-                                break
-                        if not match_found:
+                        index = self.weapon_models[i].row_for_id(equipment_id)
+                        if index >= 0:
+                            self.weapon_fields[i].setCurrentIndex(index)
+                        else:
                             self.weapon_fields[i].setEditText(f"{equipment_id}")
         else:
             print("Assemble section not found.")
 
         _, coloring_bytes = read_section_value(decompressed_bytes, b'Coloring')
         color_datas = process_coloring_bytes(coloring_bytes)
-        for i in range(len(self.coloring_sections)):
-            self.coloring_sections[i].import_settings(color_datas[i])
+        for i in range(len(color_section_labels)):
+            self.import_section_settings(i, color_datas[i])
 
     def save_to_sl2(self):
         appdata_path = os.path.expandvars("%AppData%")
@@ -1675,64 +3897,75 @@ class DesignDecompressor(QWidget):
         if len(subdirs) == 1:
             default_dir = os.path.join(default_dir, subdirs[0])
         file_path, _ = QFileDialog.getOpenFileName(self, 'Select File', default_dir, 'Save Files (*.sl2 *.mod);;All Files (*)')
-        if file_path:
-            # Backup the original .sl2 file
-            execution_time_string = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
-            backup_filename = f"{os.path.splitext(os.path.basename(file_path))[0]}-{execution_time_string}.sl2"
-            backup_path = os.path.join(os.path.dirname(file_path), backup_filename)
-            shutil.copy(file_path, backup_path)
-
-            temp_dir = os.path.join(TOOLS_FOLDER, "temp_sl2_dir")
-            if os.path.exists(temp_dir):
-                shutil.rmtree(os.path.join(TOOLS_FOLDER, "temp_sl2_dir"))
-            os.makedirs(temp_dir, exist_ok=True)
-
-            # Copy the selected .sl2 file to the temporary directory
+        if not file_path:
+            return
+
+        # Gather everything that needs the UI first, the file work then runs on a worker thread
+        thumbnail_path = None
+        reply = QMessageBox.question(self, 'Thumbnail',
+                                     'Do you want to add a thumbnail?',
+                                     QMessageBox.StandardButton.Yes |
+                                     QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            fname, _ = QFileDialog.getOpenFileName(None, 'Open file',
+                                                   filter="Image files (*.jpg *.png *.bmp)")
+            if fname:
+                thumbnail_path = fname
+        design_data = self.generate_design_from_ui()
+
+        execution_time_string = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
+        # The scratch workspace lives in RAM where possible, and is only cleared the next time it's used
+        with scratch_space.workspace("write_sl2") as temp_dir:
             temp_sl2_path = os.path.join(temp_dir, os.path.basename(file_path) + f"-{execution_time_string}")
-            shutil.copy(file_path, temp_sl2_path)
-
-            # Unpack the .sl2
-            run_witchy(temp_sl2_path)
-
-            # Find the unpacked folder
             file_parts = os.path.splitext(os.path.basename(file_path))
             unpacked_folder = f"{file_parts[0]}-{file_parts[1][1:]}"
             unpacked_path = os.path.join(temp_dir, unpacked_folder + f"-{execution_time_string}")
 
+            def read_save(report):
+                report("Unpacking")
+                # Copy the selected .sl2 file to the temporary directory and unpack it
+                shutil.copy(file_path, temp_sl2_path)
+                run_witchy(temp_sl2_path)
+
+                # Back up the original while its entries are still encrypted, only what changed since the last backup gets stored
+                with SaveBackupStore() as backup_store:
+                    backup_store.add_backup(file_path, unpacked_path, report)
+
+                #Construct the preset:
+                thumbnail = ACThumbnail.empty_thumbnail()
+                if thumbnail_path:
+                    report("Converting thumbnail")
+                    thumbnail = ACThumbnail.from_image(thumbnail_path)
+
+                new_preset = Preset(1, date_time=datetime.datetime.now(), design=ASMC(design_data),
+                                    thumbnail=thumbnail)
+                preset_length = len(new_preset.to_bytes())
+
+                categories = []
+                user_datas = dict()
+
+                #Iterate over the data files, getting the amount of presets for each
+                for data_idx in range(2, 7):
+                    data_path = os.path.join(unpacked_path, f"USER_DATA0{str(data_idx).zfill(2)}")
+                    report("Decrypting", data_idx - 2, 5)
+                    decrypt_file(data_path)
+                    report("Parsing", data_idx - 2, 5)
+                    with open(data_path, "rb") as file:
+                        user_data = UserDesignData.from_bytes(file.read())
+                    print(data_idx)
+                    if user_data.to_bytes()[1] + preset_length < UserDesignData.inner_size:
+                        # We have enough space here.
+                        categories.append(f"Tab {data_idx-1}")
+                        if data_idx == 6:
+                            categories[-1] += " (Presets)"
+                    user_datas[data_idx] = user_data
+                return new_preset, categories, user_datas
 
-            #Construct the preset:
-            thumbnail = ACThumbnail.empty_thumbnail()
-            reply = QMessageBox.question(self, 'Thumbnail',
-                                         'Do you want to add a thumbnail?',
-                                         QMessageBox.StandardButton.Yes |
-                                         QMessageBox.StandardButton.No,
-                                         QMessageBox.StandardButton.No)
-            if reply == QMessageBox.StandardButton.Yes:
-                fname, _ = QFileDialog.getOpenFileName(None, 'Open file',
-                                                       filter="Image files (*.jpg *.png *.bmp)")
-                if fname:
-                    thumbnail = ACThumbnail.from_image(fname)
-
-            new_preset = Preset(1, date_time=datetime.datetime.now(), design=ASMC(self.generate_design_from_ui()),
-                                thumbnail=thumbnail)
-            preset_length = len(new_preset.to_bytes())
-
-            categories = []
-            user_datas = dict()
-
-            #Iterate over the data files, getting the amount of presets for each
-            for data_idx in range(2, 7):
-                data_path = os.path.join(unpacked_path, f"USER_DATA0{str(data_idx).zfill(2)}")
-                decrypt_file(data_path)
-                with open(data_path, "rb") as file:
-                    user_data = UserDesignData.from_bytes(file.read())
-                print(data_idx)
-                if user_data.to_bytes()[1] + preset_length < UserDesignData.inner_size:
-                    # We have enough space here.
-                    categories.append(f"Tab {data_idx-1}")
-                    if data_idx == 6:
-                        categories[-1] += " (Presets)"
-                user_datas[data_idx] = user_data
+            try:
+                new_preset, categories, user_datas = TaskDialog("Reading save", read_save, self).run()
+            except TaskCancelled:
+                return
 
             if len(categories) == 0:
                 QMessageBox.critical(None, "Error", f"You don't have any space remaining in this save file!")
@@ -1754,49 +3987,66 @@ class DesignDecompressor(QWidget):
                     new_preset_index += len(value.presets)
 
             new_preset_index += preset_multiplier
-            for data_idx, user_data in user_datas.items():
-                if data_idx == selected_category:
-                    for _ in range(preset_multiplier):
-                        user_data.add_preset(new_preset)
-
-                data_path = os.path.join(unpacked_path, f"USER_DATA0{str(data_idx).zfill(2)}")
-                with open(data_path, "wb") as file:
-                    file.write(user_data.to_bytes(new_preset_index)[0])
-                encrypt_file(data_path)
-
-            run_witchy(unpacked_path)
-
-            max_attempts = 5
-            for attempt in range(max_attempts):
-                verify_sl2_path = os.path.join(temp_dir, f"{os.path.splitext(os.path.basename(temp_sl2_path))[0]}-verify-{execution_time_string}.sl2")
-                shutil.copy(temp_sl2_path, verify_sl2_path)
-
-                file_parts = os.path.splitext(os.path.basename(verify_sl2_path))
-                verify_unpacked_folder = f"{file_parts[0]}-{file_parts[1][1:]}"
-                verify_unpacked_path = os.path.join(temp_dir, verify_unpacked_folder)
-                run_witchy(verify_sl2_path)
-
-                files_match = True
-                for root, _, files in os.walk(unpacked_path):
-                    for file in files:
-                        if "xml" in file.lower():
-                            continue
-                        original_file = os.path.join(root, file)
-                        verify_file = os.path.join(verify_unpacked_path, os.path.relpath(original_file, unpacked_path))
-
-                        if not os.path.exists(verify_file) or not filecmp.cmp(original_file, verify_file, shallow=False):
-                            files_match = False
-
-                shutil.rmtree(verify_unpacked_path)
-                if files_match:
-                    break
-            else:
-                broken_sl2_path = os.path.join(os.path.dirname(file_path), f"{os.path.splitext(os.path.basename(temp_sl2_path))[0]}-broken.sl2")
-                QMessageBox.critical(self, "Verification Failed", f"Unable to verify the save file after multiple attempts. The save might be corrupted. It has been saved as {broken_sl2_path}")
-                shutil.copy(temp_sl2_path, broken_sl2_path)
+
+            def write_save(report):
+                for data_idx, user_data in user_datas.items():
+                    if data_idx == selected_category:
+                        for _ in range(preset_multiplier):
+                            user_data.add_preset(new_preset)
+
+                    data_path = os.path.join(unpacked_path, f"USER_DATA0{str(data_idx).zfill(2)}")
+                    report("Writing", data_idx - 2, 5)
+                    with open(data_path, "wb") as file:
+                        file.write(user_data.to_bytes(new_preset_index)[0])
+                    report("Encrypting", data_idx - 2, 5)
+                    encrypt_file(data_path)
+
+                report("Repacking")
+                run_witchy(unpacked_path)
+
+                max_attempts = 5
+                for attempt in range(max_attempts):
+                    report("Verifying", attempt, max_attempts)
+                    verify_sl2_path = os.path.join(temp_dir, f"{os.path.splitext(os.path.basename(temp_sl2_path))[0]}-verify-{execution_time_string}.sl2")
+                    shutil.copy(temp_sl2_path, verify_sl2_path)
+
+                    verify_file_parts = os.path.splitext(os.path.basename(verify_sl2_path))
+                    verify_unpacked_folder = f"{verify_file_parts[0]}-{verify_file_parts[1][1:]}"
+                    verify_unpacked_path = os.path.join(temp_dir, verify_unpacked_folder)
+                    run_witchy(verify_sl2_path)
+
+                    files_match = True
+                    for root, _, files in os.walk(unpacked_path):
+                        for file in files:
+                            if "xml" in file.lower():
+                                continue
+                            original_file = os.path.join(root, file)
+                            verify_file = os.path.join(verify_unpacked_path, os.path.relpath(original_file, unpacked_path))
+
+                            if not os.path.exists(verify_file) or not filecmp.cmp(original_file, verify_file, shallow=False):
+                                files_match = False
+
+                    shutil.rmtree(verify_unpacked_path)
+                    if files_match:
+                        break
+                else:
+                    broken_sl2_path = os.path.join(os.path.dirname(file_path), f"{os.path.splitext(os.path.basename(temp_sl2_path))[0]}-broken.sl2")
+                    shutil.copy(temp_sl2_path, broken_sl2_path)
+                    return broken_sl2_path
+
+                # Last chance to cancel before the original save is overwritten
+                report("Saving")
+                shutil.copy(temp_sl2_path, file_path)
+                return None
+
+            try:
+                broken_sl2_path = TaskDialog("Writing save", write_save, self).run()
+            except TaskCancelled:
                 return
 
-            shutil.copy(temp_sl2_path, file_path)
+            if broken_sl2_path:
+                QMessageBox.critical(self, "Verification Failed", f"Unable to verify the save file after multiple attempts. The save might be corrupted. It has been saved as {broken_sl2_path}")
+                return
             QMessageBox.information(self, "Save Complete", f"Design added to save file.")
 
     def generate_design_from_ui(self) -> bytes:
@@ -1902,8 +4152,8 @@ class DesignDecompressor(QWidget):
 
         # Write the color sets
         color_set_data = BytesIO()
-        for i, section in enumerate(self.coloring_sections):
-            section_data_bytes = section.export_settings().to_bytes()
+        for i in range(len(color_section_labels)):
+            section_data_bytes = self.export_section_settings(i).to_bytes()
             color_set_data.write(section_data_bytes)
             # Write dummy data for unknown sections
             if i == 5:  # After Right weapon
@@ -1963,6 +4213,41 @@ class DesignDecompressor(QWidget):
 
             return modified_data.getvalue()
 
+    def check_tool_updates(self):
+        self.update_check_thread = ToolUpdateCheckThread(self)
+        self.update_check_thread.releasesSignal.connect(self.offer_tool_updates)
+        self.update_check_thread.start()
+
+    def closeEvent(self, event):
+        # The update check can still be waiting on the network, and destroying a running QThread aborts the app
+        if self.update_check_thread is not None and self.update_check_thread.isRunning():
+            self.update_check_thread.requestInterruption()
+            self.update_check_thread.wait()
+        super().closeEvent(event)
+
+    def offer_tool_updates(self, releases, fresh):
+        versions = load_versions()
+        if fresh:
+            cache_latest_releases(versions, releases)
+
+        skipped = versions.get("skipped", {})
+        outdated_tools = [tool for tool, release in releases.items()
+                          if versions.get(tool) != release["tag"] and skipped.get(tool) != release["tag"]]
+        if outdated_tools:
+            update_list = "\n".join(f"{tool}: {versions.get(tool, 'none')} -> {releases[tool]['tag']}" for tool in outdated_tools)
+            reply = QMessageBox.question(self, 'Updates available',
+                                         f"Tool updates are available:\n{update_list}\n\nDownload them now?",
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                         QMessageBox.StandardButton.Yes)
+            for tool in outdated_tools:
+                if reply == QMessageBox.StandardButton.Yes:
+                    install_tool(tool, releases[tool], versions)
+                else:
+                    skipped[tool] = releases[tool]["tag"]
+            versions["skipped"] = skipped
+
+        save_versions(versions)
+
     def save_design_file(self):
         file_path, _ = QFileDialog.getSaveFileName(self, 'Save File', '', 'All Files (*)')
         if file_path:
@@ -1973,12 +4258,17 @@ class DesignDecompressor(QWidget):
 
             QMessageBox.information(self, "Save Complete", f"Design file saved as {file_path}.")
 
-def get_github_release(repo_owner, repo_name, tag=None) -> (str, list):
+def get_github_release(repo_owner, repo_name, tag=None, timeout=10) -> (str, list):
     if tag:
         api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/tags/{tag}"
     else:
         api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
-    response = requests.get(api_url)
+    import requests
+    try:
+        response = requests.get(api_url, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        print(f"Could not reach GitHub for {repo_owner}/{repo_name}: {e}")
+        return None
     if response.status_code == 200:
         release_data = response.json()
         latest_tag = release_data["tag_name"]
@@ -1987,41 +4277,102 @@ def get_github_release(repo_owner, repo_name, tag=None) -> (str, list):
         return None
 
 
+# How long the cached release info in versions.json is trusted before asking GitHub again
+VERSION_CHECK_TTL = 6 * 60 * 60
 
-def check_tools():
-    os.makedirs(TOOLS_FOLDER, exist_ok=True)
+tool_releases = {
+    "witchy": ("ividyon", "WitchyBND")
+}
+# The file whose presence means a tool is installed
+tool_paths = {
+    "witchy": witchy_path
+}
 
+def load_versions() -> dict:
     if not os.path.exists(VERSIONS_FILE):
-        with open(VERSIONS_FILE, "w") as fp:
-            json.dump({}, fp)
-
+        return {}
     with open(VERSIONS_FILE, 'r') as file:
-        versions = json.load(file)
+        return json.load(file)
 
-    global texconv_path
-    texconv_path = os.path.join(TOOLS_FOLDER, "DirectXTex", "texconv.exe")
-    os.makedirs(os.path.join(TOOLS_FOLDER, "DirectXTex"), exist_ok=True)
-    latest_texconv_release = get_github_release("microsoft", "DirectXTex")
-    if latest_texconv_release and versions.get("texconv", "0.0") != latest_texconv_release[0]:
-        DownloadDialog(f"Downloading texconv", "https://github.com/microsoft/DirectXTex/releases/latest/download/texconv.exe", texconv_path).exec()
-        versions["texconv"] = latest_texconv_release[0]
+def save_versions(versions:dict):
+    with open(VERSIONS_FILE, 'w') as file:
+        json.dump(versions, file, indent=4)
 
-    os.makedirs(witchy_dir, exist_ok=True)
-    latest_witchy_release = get_github_release("ividyon", "WitchyBND")
-    if latest_witchy_release and versions.get("witchy", "0.0") != latest_witchy_release[0]:
+def tool_installed(tool) -> bool:
+    return os.path.exists(tool_paths[tool])
+
+def get_latest_releases(versions:dict, max_age=VERSION_CHECK_TTL) -> (dict, bool):
+    """
+    Get the latest release of every tool, using the cache in versions.json if it's recent enough.
+    :param versions: The contents of versions.json
+    :param max_age: Maximum age of the cache in seconds
+    :return: A tuple of ({tool: {"tag": ..., "urls": [...]}}, whether the result was freshly fetched)
+    """
+    cached_releases = versions.get("latest_releases", {})
+    cache_age = time.time() - versions.get("last_checked", 0)
+    if cache_age < max_age and all(tool in cached_releases for tool in tool_releases):
+        return cached_releases, False
+
+    releases = {}
+    for tool, (repo_owner, repo_name) in tool_releases.items():
+        release = get_github_release(repo_owner, repo_name)
+        if release:
+            releases[tool] = {"tag": release[0], "urls": [asset["browser_download_url"] for asset in release[1]]}
+    return releases, True
+
+def cache_latest_releases(versions:dict, releases:dict):
+    versions.setdefault("latest_releases", {}).update(releases)
+    if all(tool in releases for tool in tool_releases):
+        # Only consider the cache fresh if every check went through, so a flaky connection gets retried next time
+        versions["last_checked"] = time.time()
+
+def install_tool(tool, release:dict, versions:dict):
+    if tool == "witchy":
+        import zipfile
         zip_path = os.path.join(witchy_dir, "witchy.zip")
-        DownloadDialog(f"Downloading WitchyBND", latest_witchy_release[1][0]["browser_download_url"], zip_path).exec()
+        DownloadDialog(f"Downloading WitchyBND", release["urls"][0], zip_path).exec()
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
             zip_ref.extractall(witchy_dir)
+    versions[tool] = release["tag"]
 
-        versions["witchy"] = latest_witchy_release[0]
+class ToolUpdateCheckThread(QtCore.QThread):
+    releasesSignal = QtCore.pyqtSignal(dict, bool)
 
-    with open(VERSIONS_FILE, 'w') as file:
-        json.dump(versions, file, indent=4)
+    def run(self):
+        releases, fresh = get_latest_releases(load_versions())
+        if not self.isInterruptionRequested():
+            self.releasesSignal.emit(releases, fresh)
+
+def check_tools():
+    """
+    Make sure the tools are present. Only tools that are missing are downloaded here (which blocks),
+    update checks for installed tools happen in the background via ToolUpdateCheckThread.
+    """
+    os.makedirs(TOOLS_FOLDER, exist_ok=True)
+    versions = load_versions()
+
+    os.makedirs(witchy_dir, exist_ok=True)
+
+    missing_tools = [tool for tool in tool_releases if tool not in versions or not tool_installed(tool)]
+    if missing_tools:
+        releases, fresh = get_latest_releases(versions, max_age=0)
+        cache_latest_releases(versions, releases)
+        for tool in missing_tools:
+            if tool in releases:
+                install_tool(tool, releases[tool], versions)
+
+    save_versions(versions)
 
 
 
 if __name__ == '__main__':
+    # Worker processes of frozen builds re-run this script, and need to be told apart from a normal start
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == "recolor":
+        sys.exit(run_recolor_command(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "restore":
+        sys.exit(run_restore_command(sys.argv[2:]))
+
     colors_dict = {
         "primary_color": "#1A1D22",
         "secondary_color": "#282C34",
@@ -2041,9 +4392,13 @@ if __name__ == '__main__':
     app = QApplication([])
 
     app.setStyleSheet(stylesheet)
-    check_tools()
-
-    decompressor = DesignDecompressor()
-    decompressor.show()
+    with startup_trace.stage("check_tools"):
+        check_tools()
+
+    with startup_trace.stage("window creation"):
+        decompressor = DesignDecompressor()
+        decompressor.show()
+    QtCore.QTimer.singleShot(0, startup_trace.report)
+    QtCore.QTimer.singleShot(0, decompressor.check_tool_updates)
 
     app.exec()
\ No newline at end of file
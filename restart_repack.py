@@ -1,13 +1,295 @@
-import subprocess
+import hashlib
+import json
 import sys
 import os
+import threading
+import time
 
 import keyring
+import platformdirs
+from typing import List, Dict
 from PyQt6 import QtWidgets, QtCore, QtGui
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QListWidget, QFileDialog, QMessageBox, QLineEdit, QLabel, QDialog, QAbstractItemView)
+                             QPushButton, QListWidget, QFileDialog, QMessageBox, QLineEdit, QLabel, QDialog, QAbstractItemView, QCheckBox)
 from PyQt6.QtCore import QProcess
 
+# Content hashes of the directories as they were last repacked successfully
+MANIFEST_FILE = os.path.join(platformdirs.user_data_dir(appauthor="lugia19", roaming=True, appname="ac6_tools"), "repack_manifest.json")
+# How long the watched directories have to be quiet before a repack starts, so a burst of saves becomes one repack
+WATCH_DEBOUNCE_MS = 1000
+# WitchyBND is mostly IO and single threaded, a few at once is plenty
+MAX_PARALLEL_REPACKS = min(4, os.cpu_count() or 1)
+# Hashing runs on worker threads while finished repacks get recorded on the GUI thread
+manifest_lock = threading.Lock()
+
+def load_manifest() -> dict:
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    with open(MANIFEST_FILE, 'r') as file:
+        return json.load(file)
+
+def save_manifest(manifest:dict):
+    os.makedirs(os.path.dirname(MANIFEST_FILE), exist_ok=True)
+    with open(MANIFEST_FILE, 'w') as file:
+        json.dump(manifest, file, indent=4)
+
+def hash_directory(dir_path, file_hashes:dict) -> str:
+    """
+    Hash the names and contents of every file in a directory.
+    :param file_hashes: {relative path: [size, mtime_ns, sha1]} from the previous run. Files whose size and mtime
+                        still match aren't read again. Updated in place.
+    """
+    directory_hash = hashlib.sha1()
+    seen_files = set()
+    for root, dirs, files in os.walk(dir_path):
+        dirs.sort()
+        for filename in sorted(files):
+            file_path = os.path.join(root, filename)
+            relative_path = os.path.relpath(file_path, dir_path).replace(os.sep, "/")
+            stat = os.stat(file_path)
+            cached = file_hashes.get(relative_path)
+            if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                file_hash = cached[2]
+            else:
+                content_hash = hashlib.sha1()
+                with open(file_path, 'rb') as file:
+                    for block in iter(lambda: file.read(1024 * 1024), b""):
+                        content_hash.update(block)
+                file_hash = content_hash.hexdigest()
+                file_hashes[relative_path] = [stat.st_size, stat.st_mtime_ns, file_hash]
+            seen_files.add(relative_path)
+            directory_hash.update(f"{relative_path}\0{file_hash}\0".encode('utf-8'))
+
+    for relative_path in set(file_hashes) - seen_files:
+        del file_hashes[relative_path]
+    return directory_hash.hexdigest()
+
+def find_changed_directories(dir_paths, force=False) -> (Dict[str, str], List[str]):
+    """
+    Hash the directories and compare them against their last successful repack. Reads every changed file, so
+    RepackUI runs it on a worker thread through a FunctionJob.
+    :param force: Treat every directory as changed
+    :return: A tuple of ({changed directory: its new hash}, [unchanged directories])
+    """
+    with manifest_lock:
+        manifest = load_manifest()
+    changed_directories = {}
+    unchanged_directories = []
+    directory_entries = {}
+    for dir_path in dir_paths:
+        entry = manifest.get(os.path.normpath(dir_path), {"hash": None, "files": {}})
+        directory_hash = hash_directory(dir_path, entry["files"])
+        directory_entries[os.path.normpath(dir_path)] = entry["files"]
+        if not force and entry["hash"] == directory_hash:
+            unchanged_directories.append(dir_path)
+        else:
+            changed_directories[dir_path] = directory_hash
+
+    # Saved right away so the per-file hashes are reused even if the repack never finishes.
+    # Reloaded first so a repack recorded while hashing isn't lost.
+    with manifest_lock:
+        manifest = load_manifest()
+        for dir_key, file_hashes in directory_entries.items():
+            manifest.setdefault(dir_key, {"hash": None, "files": {}})["files"] = file_hashes
+        save_manifest(manifest)
+    return changed_directories, unchanged_directories
+
+def record_repack(dir_path, directory_hash, success):
+    # Only remember the hash once it's made it into the packed file
+    with manifest_lock:
+        manifest = load_manifest()
+        manifest.setdefault(os.path.normpath(dir_path), {"hash": None, "files": {}})["hash"] = directory_hash if success else None
+        save_manifest(manifest)
+
+class Job(QtCore.QObject):
+    """
+    A unit of work started by a JobQueue once all of its dependencies have succeeded.
+    """
+    outputSignal = QtCore.pyqtSignal(str)
+    statusSignal = QtCore.pyqtSignal(object)
+    finishedSignal = QtCore.pyqtSignal(object)
+
+    def __init__(self, name, dependencies=(), after=(), allow_failure=False):
+        """
+        :param dependencies: Jobs that have to succeed first, this one gets skipped if any of them fails
+        :param after: Jobs that only have to be finished first, however they went
+        :param allow_failure: Let dependent jobs run even if this one fails (e.g. killing a game that isn't running)
+        """
+        super().__init__()
+        self.name = name
+        self.dependencies = list(dependencies)
+        self.after = list(after)
+        self.allow_failure = allow_failure
+        self.status = "queued"
+        self.start_time = None
+        self.elapsed = 0.0
+
+    def is_finished(self):
+        return self.status in ("done", "failed", "skipped")
+
+    def satisfies_dependents(self):
+        return self.status == "done" or (self.status == "failed" and self.allow_failure)
+
+    def set_status(self, status):
+        self.status = status
+        self.statusSignal.emit(self)
+        if self.is_finished():
+            self.finishedSignal.emit(self)
+
+    def is_ready(self):
+        return all(dependency.satisfies_dependents() for dependency in self.dependencies) and all(job.is_finished() for job in self.after)
+
+    def start(self):
+        raise NotImplementedError
+
+    def cancel(self):
+        if self.status == "queued":
+            self.set_status("skipped")
+
+class FunctionJob(Job):
+    """
+    Runs a Python function on a worker thread, keeping the GUI responsive. Its return value ends up in result.
+    """
+    completedSignal = QtCore.pyqtSignal(object, object)
+
+    def __init__(self, name, function, args=(), **kwargs):
+        super().__init__(name, **kwargs)
+        self.function = function
+        self.args = list(args)
+        self.result = None
+        # Emitted from the worker thread, delivered on the thread this job lives on
+        self.completedSignal.connect(self.handle_completed)
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.set_status("running")
+        # Daemon, so a long hash doesn't keep the app alive after its window is closed
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        try:
+            self.completedSignal.emit(self.function(*self.args), None)
+        except Exception as e:
+            self.completedSignal.emit(None, e)
+
+    def handle_completed(self, result, error):
+        self.elapsed = time.perf_counter() - self.start_time
+        self.result = result
+        if error is not None:
+            self.outputSignal.emit(f"{self.name} failed: {error}\n")
+        self.set_status("failed" if error is not None else "done")
+
+class ProcessJob(Job):
+    """
+    One external command run through QProcess.
+    """
+    def __init__(self, name, program, args=(), working_dir=None, detached=False, **kwargs):
+        """
+        :param detached: Launch the program and consider the job done, without waiting for it to exit
+        """
+        super().__init__(name, **kwargs)
+        self.program = program
+        self.args = list(args)
+        self.working_dir = working_dir
+        self.detached = detached
+        self.process = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        if self.detached:
+            started, _ = QProcess.startDetached(self.program, self.args, self.working_dir or "")
+            if not started:
+                self.outputSignal.emit(f"Could not start {self.program}\n")
+            self.set_status("done" if started else "failed")
+            return
+
+        self.process = QProcess(self)
+        if self.working_dir:
+            self.process.setWorkingDirectory(self.working_dir)
+        self.process.readyReadStandardOutput.connect(self.handle_stdout)
+        self.process.readyReadStandardError.connect(self.handle_stderr)
+        self.process.finished.connect(self.handle_finished)
+        self.process.errorOccurred.connect(self.handle_error)
+        self.set_status("running")
+        self.process.start(self.program, self.args)
+
+    def cancel(self):
+        if self.status == "running":
+            self.process.kill()
+        else:
+            super().cancel()
+
+    def handle_stdout(self):
+        data = self.process.readAllStandardOutput()
+        self.outputSignal.emit(bytes(data).decode("utf8", errors="replace"))
+
+    def handle_stderr(self):
+        data = self.process.readAllStandardError()
+        self.outputSignal.emit(bytes(data).decode("utf8", errors="replace"))
+
+    def handle_finished(self, exit_code, exit_status):
+        self.elapsed = time.perf_counter() - self.start_time
+        succeeded = exit_status == QProcess.ExitStatus.NormalExit and exit_code == 0
+        self.set_status("done" if succeeded else "failed")
+
+    def handle_error(self, error):
+        # A process that never started won't emit finished
+        if error == QProcess.ProcessError.FailedToStart:
+            self.outputSignal.emit(f"Could not start {self.program}: {self.process.errorString()}\n")
+            self.set_status("failed")
+
+class JobQueue(QtCore.QObject):
+    """
+    Runs Jobs as soon as their dependencies allow, at most max_running at once.
+    """
+    def __init__(self, max_running=MAX_PARALLEL_REPACKS, parent=None):
+        super().__init__(parent)
+        self.max_running = max_running
+        self.jobs: List[Job] = []
+        self.scheduling = False
+
+    def add(self, job:Job) -> Job:
+        job.setParent(self)
+        job.finishedSignal.connect(lambda _: self.schedule())
+        self.jobs.append(job)
+        self.schedule()
+        return job
+
+    def schedule(self):
+        # Skipping or starting a job can finish it right away, which calls back into here
+        if self.scheduling:
+            return
+        self.scheduling = True
+        try:
+            progress = True
+            while progress:
+                progress = False
+                running_count = sum(1 for job in self.jobs if job.status == "running")
+                for job in self.jobs:
+                    if job.status != "queued":
+                        continue
+                    if any(dependency.is_finished() and not dependency.satisfies_dependents() for dependency in job.dependencies):
+                        job.set_status("skipped")
+                        progress = True
+                    elif running_count < self.max_running and job.is_ready():
+                        job.start()
+                        progress = True
+                        break
+        finally:
+            self.scheduling = False
+
+    def is_busy(self):
+        return not all(job.is_finished() for job in self.jobs)
+
+    def clear_finished(self):
+        for job in [job for job in self.jobs if job.is_finished()]:
+            self.jobs.remove(job)
+            job.deleteLater()
+
+    def cancel_all(self):
+        for job in list(self.jobs):
+            job.cancel()
+
 class ConfigDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -64,26 +346,135 @@ class ConfigDialog(QDialog):
         keyring.set_password("AC6Repack", "armoredcore_bat_path", self.ac_path.text())
         self.accept()
 
+def list_watch_paths(roots) -> Dict[str, List[str]]:
+    """
+    :return: {root: every directory and file under it}
+    """
+    root_paths = {}
+    for root in roots:
+        paths = []
+        for dir_path, _, files in os.walk(root):
+            paths.append(dir_path)
+            paths.extend(os.path.join(dir_path, filename) for filename in files)
+        root_paths[root] = paths
+    return root_paths
+
+class DirectoryWatcher(QtCore.QObject):
+    """
+    Watches directory trees for changes and emits the roots that changed once they've been quiet for WATCH_DEBOUNCE_MS.
+    Changes are only hints, find_changed_directories still compares hashes before anything gets repacked.
+    Walking the trees for the paths to watch happens on a worker thread, only the watches get updated on the GUI thread.
+    """
+    changedSignal = QtCore.pyqtSignal(list)
+    scannedSignal = QtCore.pyqtSignal(int, dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.roots = []
+        self.root_paths = {}
+        self.pending_roots = set()
+        # Bumped whenever the roots change, so a scan that finishes afterwards is ignored
+        self.generation = 0
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.path_changed)
+        self.watcher.fileChanged.connect(self.path_changed)
+        self.debounce_timer = QtCore.QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.emit_changes)
+        self.scannedSignal.connect(self.apply_scan)
+
+    def set_roots(self, roots):
+        self.roots = [os.path.normpath(root) for root in roots]
+        self.root_paths = {root: [root] for root in self.roots}
+        self.generation += 1
+        self.pending_roots.clear()
+        self.set_watched_paths([path for paths in self.root_paths.values() for path in paths])
+        self.refresh_paths(self.roots)
+
+    def stop(self):
+        self.debounce_timer.stop()
+        self.generation += 1
+        self.pending_roots.clear()
+        self.root_paths = {}
+        self.set_watched_paths([])
+
+    def refresh_paths(self, roots):
+        # New files and directories need watching too, and editors that save by replacing a file drop its watch
+        generation = self.generation
+        threading.Thread(target=lambda: self.scannedSignal.emit(generation, list_watch_paths(roots)), daemon=True).start()
+
+    def apply_scan(self, generation, root_paths):
+        if generation != self.generation:
+            return
+        self.root_paths.update(root_paths)
+        self.set_watched_paths([path for paths in self.root_paths.values() for path in paths])
+
+    def set_watched_paths(self, paths):
+        watched_paths = set(self.watcher.files() + self.watcher.directories())
+        removed_paths = list(watched_paths - set(paths))
+        added_paths = [path for path in paths if path not in watched_paths]
+        if removed_paths:
+            self.watcher.removePaths(removed_paths)
+        if added_paths:
+            self.watcher.addPaths(added_paths)
+
+    def path_changed(self, path):
+        path = os.path.normpath(path)
+        for root in self.roots:
+            if path == root or path.startswith(root + os.sep):
+                self.pending_roots.add(root)
+        self.debounce_timer.start()
+
+    def emit_changes(self):
+        changed_roots = [root for root in self.roots if root in self.pending_roots]
+        self.pending_roots.clear()
+        if changed_roots:
+            # Only the trees that changed get walked again
+            self.refresh_paths(changed_roots)
+            self.changedSignal.emit(changed_roots)
+
 class RepackUI(QWidget):
     def __init__(self):
         super().__init__()
+        self.job_queue = JobQueue(parent=self)
+        self.job_items = {}
+        # The latest repack job of every directory, so the same directory never gets packed twice at once
+        self.repack_jobs = {}
         self.initUI()
 
-        # Hardcoded paths (replace with actual paths)
-
-        self.process = QProcess(self)
-        self.process.readyReadStandardOutput.connect(self.handle_stdout)
-        self.process.readyReadStandardError.connect(self.handle_stderr)
-
-    def handle_stdout(self):
-        data = self.process.readAllStandardOutput()
-        stdout = bytes(data).decode("utf8")
-        print(stdout, end="")
+        self.watcher = DirectoryWatcher(self)
+        self.watcher.changedSignal.connect(self.watched_directories_changed)
+
+    def log(self, text):
+        print(text, end="")
+        self.log_view.moveCursor(QtGui.QTextCursor.MoveOperation.End)
+        self.log_view.insertPlainText(text)
+        self.log_view.moveCursor(QtGui.QTextCursor.MoveOperation.End)
+
+    def add_job(self, job:Job) -> Job:
+        item = QtWidgets.QListWidgetItem(f"{job.name}: {job.status}")
+        self.job_list.addItem(item)
+        self.job_items[job] = item
+        job.outputSignal.connect(self.log)
+        job.statusSignal.connect(self.update_job_status)
+        return self.job_queue.add(job)
+
+    def update_job_status(self, job:Job):
+        item = self.job_items.get(job)
+        if item is None:
+            return
+        if job.status in ("done", "failed"):
+            item.setText(f"{job.name}: {job.status} ({job.elapsed:.2f}s)")
+            self.log(f"{job.name}: {job.status} in {job.elapsed:.2f}s\n")
+        else:
+            item.setText(f"{job.name}: {job.status}")
 
-    def handle_stderr(self):
-        data = self.process.readAllStandardError()
-        stderr = bytes(data).decode("utf8")
-        print(stderr, end="", file=sys.stderr)
+    def clear_finished_jobs(self):
+        for job in [job for job in self.job_queue.jobs if job.is_finished()]:
+            self.job_list.takeItem(self.job_list.row(self.job_items.pop(job)))
+        self.repack_jobs = {dir_path: job for dir_path, job in self.repack_jobs.items() if not job.is_finished()}
+        self.job_queue.clear_finished()
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -107,9 +498,9 @@ class RepackUI(QWidget):
         self.kill_btn = QPushButton('Kill')
         self.repack_btn = QPushButton('Repack')
         self.start_btn = QPushButton('Start')
-        self.kill_btn.clicked.connect(self.kill_process)
-        self.repack_btn.clicked.connect(self.repack)
-        self.start_btn.clicked.connect(self.start)
+        self.kill_btn.clicked.connect(lambda: self.kill_process())
+        self.repack_btn.clicked.connect(lambda: self.repack())
+        self.start_btn.clicked.connect(lambda: self.start())
         action_layout.addWidget(self.kill_btn)
         action_layout.addWidget(self.repack_btn)
         action_layout.addWidget(self.start_btn)
@@ -117,8 +508,26 @@ class RepackUI(QWidget):
 
         # Restart & Repack button
         self.restart_repack_btn = QPushButton('Repack And Restart')
-        self.restart_repack_btn.clicked.connect(self.restart_and_repack)
+        self.restart_repack_btn.clicked.connect(lambda: self.restart_and_repack())
         layout.addWidget(self.restart_repack_btn)
+
+        # Watch mode
+        watch_layout = QHBoxLayout()
+        self.watch_btn = QPushButton('Watch')
+        self.watch_btn.setCheckable(True)
+        self.watch_btn.toggled.connect(self.toggle_watch)
+        self.watch_restart_checkbox = QCheckBox('Restart game after repack')
+        watch_layout.addWidget(self.watch_btn)
+        watch_layout.addWidget(self.watch_restart_checkbox)
+        layout.addLayout(watch_layout)
+
+        # Jobs and their output
+        self.job_list = QListWidget()
+        self.job_list.setMaximumHeight(120)
+        layout.addWidget(self.job_list)
+        self.log_view = QtWidgets.QPlainTextEdit()
+        self.log_view.setReadOnly(True)
+        layout.addWidget(self.log_view)
         self.load_existing_directories()
         self.setLayout(layout)
         self.setWindowTitle('AC6 Repack Helper')
@@ -137,11 +546,36 @@ class RepackUI(QWidget):
             for directory in selected_directories:
                 self.dir_list.addItem(directory)
         dialog.deleteLater()
+        self.update_watched_directories()
 
     def remove_directory(self):
         current_row = self.dir_list.currentRow()
         if current_row >= 0:
             self.dir_list.takeItem(current_row)
+        self.update_watched_directories()
+
+    def selected_directories(self):
+        return [self.dir_list.item(index).text() for index in range(self.dir_list.count())]
+
+    def update_watched_directories(self):
+        if self.watch_btn.isChecked():
+            self.watcher.set_roots(self.selected_directories())
+
+    def toggle_watch(self, checked):
+        if checked:
+            self.watcher.set_roots(self.selected_directories())
+            self.watch_btn.setText('Watching...')
+            self.log("Watching for changes\n")
+        else:
+            self.watcher.stop()
+            self.watch_btn.setText('Watch')
+            self.log("Stopped watching\n")
+
+    def watched_directories_changed(self, dir_paths):
+        self.log(f"Possible changes in: {', '.join(dir_paths)}\n")
+        # Filesystem events are only hints, the game is only restarted if the hashes show a real change
+        self.clear_finished_jobs()
+        self.repack(dir_paths, restart=self.watch_restart_checkbox.isChecked())
 
     def load_existing_directories(self):
         stored_directories = keyring.get_password("AC6Repack", "selected_directories")
@@ -151,48 +585,58 @@ class RepackUI(QWidget):
                 self.dir_list.addItem(directory)
 
     def save_selected_directories(self):
-        selected_directories = []
-        for index in range(self.dir_list.count()):
-            selected_directories.append(self.dir_list.item(index).text())
-        keyring.set_password("AC6Repack", "selected_directories", ';'.join(selected_directories))
+        keyring.set_password("AC6Repack", "selected_directories", ';'.join(self.selected_directories()))
 
     def closeEvent(self, event):
+        self.watcher.stop()
         self.save_selected_directories()
         event.accept()
 
-    def run_command(self, args, working_dir=None):
-        if isinstance(args, str):
-            args = [args]
-
-        completed_process = None
-        try:
-            completed_process = subprocess.run(args, check=True, capture_output=True, text=True, cwd=working_dir)
-        except subprocess.CalledProcessError as e:
-            print(f"Called process threw error: {e}")
-        finally:
-            if completed_process:
-                print(completed_process.stdout)
-                print(completed_process.stderr)
-
-
-
-    def kill_process(self):
-        self.run_command(["taskkill", "/F", "/IM", "armoredcore6.exe"])
-
-    def repack(self):
-        for index in range(self.dir_list.count()):
-            dir_path = self.dir_list.item(index).text()
-            print(f"Repacking directory: {dir_path}")
-            self.run_command([witchybnd_path, "-s", dir_path])
-
-    def start(self):
-        self.run_command([armoredcore_bat_path], working_dir=os.path.dirname(armoredcore_bat_path))
-
-    def restart_and_repack(self):
-        self.kill_process()
-        self.repack()
-        self.start()
+    def kill_process(self, dependencies=()) -> ProcessJob:
+        # taskkill fails when the game isn't running, which is fine
+        return self.add_job(ProcessJob("Kill game", "taskkill", ["/F", "/IM", "armoredcore6.exe"], dependencies=dependencies, allow_failure=True))
 
+    def repack(self, dir_paths=None, restart=False) -> FunctionJob:
+        """
+        Hash the directories on a worker thread, then queue a repack for each one that changed.
+        :param restart: Kill the game before repacking and start it again afterwards, only if anything changed
+        """
+        if dir_paths is None:
+            dir_paths = self.selected_directories()
+        hash_job = FunctionJob("Check for changes", find_changed_directories, [dir_paths])
+        hash_job.finishedSignal.connect(lambda hash_job: self.queue_repacks(hash_job, restart))
+        return self.add_job(hash_job)
+
+    def queue_repacks(self, hash_job:FunctionJob, restart=False) -> List[ProcessJob]:
+        jobs = []
+        changed_directories, unchanged_directories = hash_job.result if hash_job.status == "done" else ({}, [])
+        for dir_path in unchanged_directories:
+            self.log(f"Unchanged, skipping {dir_path}\n")
+        if not changed_directories:
+            return jobs
+
+        # The game is only killed once there's something to repack
+        dependencies = [self.kill_process()] if restart else []
+        for dir_path, directory_hash in changed_directories.items():
+            previous_job = self.repack_jobs.get(dir_path)
+            job = ProcessJob(f"Repack {dir_path}", witchybnd_path, ["-s", dir_path], dependencies=dependencies,
+                             after=[previous_job] if previous_job else [])
+            job.finishedSignal.connect(lambda job, dir_path=dir_path, directory_hash=directory_hash:
+                                       record_repack(dir_path, directory_hash, job.status == "done"))
+            self.repack_jobs[dir_path] = job
+            jobs.append(self.add_job(job))
+        if restart:
+            # Only started again once every repack succeeded
+            self.start(dependencies=dependencies + jobs)
+        return jobs
+
+    def start(self, dependencies=()) -> ProcessJob:
+        return self.add_job(ProcessJob("Start game", armoredcore_bat_path, working_dir=os.path.dirname(armoredcore_bat_path),
+                                       dependencies=dependencies, detached=True))
+
+    def restart_and_repack(self, dir_paths=None):
+        self.clear_finished_jobs()
+        self.repack(dir_paths, restart=True)
 
 if __name__ == '__main__':
     colors_dict = {
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import design_editor
+
+
+def make_design(name, parts, weapons):
+    """
+    Build a minimal decompressed design with the given parts (7 IDs) and weapons (LHand, RHand, LBack, RBack, CExpansion).
+    """
+    data = design_editor.ChunkHeader('---- begin ----', 0, 0).to_bytes()
+    for signature, value in [('UgcID', '1'), ('DataName', name), ('AcName', name)]:
+        value_bytes = value.encode('utf-16-le') + b"\x00\x00"
+        data += design_editor.ChunkHeader(signature, len(value_bytes), 0).to_bytes() + value_bytes
+
+    part_categories = ["body_part"] * 4 + ["booster", "generator", "fcs"]
+    assemble_data = b"".join(design_editor.equipment_id_to_save_id(part_id, category) for part_id, category in zip(parts, part_categories))
+    assemble_data += b'\xFF\xFF\xFF\xFF'
+    for weapon_id in weapons[:4] + [299300, 299100, -1, weapons[4]]:
+        assemble_data += b'\xFF\xFF\xFF\xFF' if weapon_id == -1 else design_editor.equipment_id_to_save_id(weapon_id, 'weapon')
+    data += design_editor.ChunkHeader('Assemble', len(assemble_data), 3).to_bytes() + assemble_data
+    return data + design_editor.ChunkHeader("----  end  ----", 0, 0).to_bytes()
+
+
+def test_metadata_keeps_core_expansion():
+    # A core expansion save ID ends in a zero byte, which read_section_value strips off the Assemble chunk
+    design = make_design("beta", [1000, 1010, 1020, 1030, 5000, 5010, 5020], [100, 110, -1, 130, 299200])
+    _, _, _, equipment_ids = design_editor.get_design_metadata(design)
+    assert equipment_ids == (1000, 1010, 1020, 1030, 5000, 5010, 5020, 100, 110, -1, 130, 299200)
+
+
+def test_search_by_equipment_with_core_expansion(tmp_path):
+    alpha = make_design("alpha", [1000, 1010, 1020, 1030, 5000, 5010, 5020], [101, 110, -1, 130, -1])
+    beta = make_design("beta", [1000, 1010, 1020, 1030, 5000, 5010, 5020], [100, 110, -1, 130, 299200])
+    with design_editor.DesignStore(str(tmp_path)) as store:
+        store.add_designs([alpha, beta])
+        assert [row[2] for row in store.search("", [("CExpansion", 299200)])] == ["beta"]
+        assert [row[2] for row in store.search("", [(None, 100)])] == ["beta"]
+        assert [row[2] for row in store.search("", [("Head", 1000)])] == ["alpha", "beta"]